@@ -100,7 +100,9 @@ if __name__ == "__main__":
             host=settings.MANAGER_HOST,
             port=settings.MANAGER_PORT,
             log_level=settings.MANAGER_DEBUG.lower(),
-            reload=settings.MANAGER_RELOAD
+            reload=settings.MANAGER_RELOAD,
+            # uvloop when installed (Linux/macOS), else the stdlib asyncio loop; it runs the dendrite queries
+            loop="auto"
         )
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
@@ -25,6 +25,7 @@ import services.protocol as protocol
 
 # import base miner class which takes care of most of the boilerplate
 from template.base.miner import BaseMinerNeuron
+from template.utils.logging import is_debug_enabled
 from services.config import settings
 
 
@@ -52,7 +53,8 @@ class Miner(BaseMinerNeuron):
         the miner's intended operation. This method demonstrates a basic transformation of input data.
         """
 
-        bt.logging.debug(f"Miner forward synapse.input: {synapse.input})")
+        if is_debug_enabled():
+            bt.logging.debug(f"Miner forward synapse.input: {synapse.input})")
         if synapse.input.get("__type__") == "health":
             bt.logging.info(f"Miner health synapse.input: {synapse.input})")
             synapse.output = {"method": "health", "success": True, "uid": self.uid, "device": self.device}
@@ -100,7 +102,7 @@ class Miner(BaseMinerNeuron):
 
         In practice it would be wise to blacklist requests from entities that are not validators, or do not have
         enough stake. This can be checked via metagraph.S and metagraph.validator_permit. You can always attain
-        the uid of the sender via a metagraph.hotkeys.index( synapse.dendrite.hotkey ) call.
+        the uid of the sender via a self.get_uid_for_hotkey( synapse.dendrite.hotkey ) call.
 
         Otherwise, allow the request to be processed further.
         """
@@ -112,10 +114,10 @@ class Miner(BaseMinerNeuron):
             return True, "Missing dendrite or hotkey"
 
         # TODO(developer): Define how miners should blacklist requests.
-        uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)
+        uid = self.get_uid_for_hotkey(synapse.dendrite.hotkey)
         if (
             not self.config.blacklist.allow_non_registered
-            and synapse.dendrite.hotkey not in self.metagraph.hotkeys
+            and uid is None
         ):
             # Ignore requests from un-registered entities.
             bt.logging.trace(
@@ -125,7 +127,7 @@ class Miner(BaseMinerNeuron):
 
         if self.config.blacklist.force_validator_permit:
             # If the config is set to force validator permit, then we should only allow requests from validators.
-            if not self.metagraph.validator_permit[uid]:
+            if uid is None or not self.metagraph.validator_permit[uid]:
                 bt.logging.warning(
                     f"Blacklisting a request from non-validator hotkey {synapse.dendrite.hotkey}"
                 )
@@ -163,9 +165,11 @@ class Miner(BaseMinerNeuron):
             return 0.0
 
         # TODO(developer): Define how miners should prioritize requests.
-        caller_uid = self.metagraph.hotkeys.index(
+        caller_uid = self.get_uid_for_hotkey(
             synapse.dendrite.hotkey
         )  # Get the caller index.
+        if caller_uid is None:
+            return 0.0
         priority = float(
             self.metagraph.S[caller_uid]
         )  # Return the stake as the priority.
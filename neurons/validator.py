@@ -22,6 +22,7 @@ import threading
 from fastapi import FastAPI, Request
 import uvicorn
 import asyncio
+import numpy as np
 
 # Bittensor
 import bittensor as bt
@@ -31,9 +32,9 @@ from template.base.validator import BaseValidatorNeuron
 
 from template.validator.reward import get_rewards
 from template.utils.uids import get_random_uids
+from template.utils.logging import is_debug_enabled
 import services.protocol as protocol
 from services.config import settings
-from services.api import ServiceApiClient
 
 
 class Validator(BaseValidatorNeuron):
@@ -45,6 +46,14 @@ class Validator(BaseValidatorNeuron):
     This class provides reasonable default behavior for a validator such as keeping a moving average of the scores of the miners and using them to set weights at the end of each epoch. Additionally, the scores are reset for new hotkeys at the end of each epoch.
     """
 
+    # Object array of metagraph axons for vectorized lookups, rebuilt when the axons list is replaced.
+    _axons_np = None
+    _axons_src = None
+    # Self ping synapses reused across concurrent_forward iterations, keyed by forward slot.
+    _ping_synapses = None
+    # Long-lived forward worker tasks keyed by forward slot, started lazily inside the validator event loop.
+    _forward_workers = None
+
     def __init__(self, config=None):
         super().__init__(config=config)
 
@@ -52,6 +61,23 @@ class Validator(BaseValidatorNeuron):
         self.load_state()
         
 
+    def _get_axons(self, uids):
+        """
+        Return the metagraph axons for the given uids using NumPy fancy indexing.
+
+        Args:
+            uids: List of UIDs to look up
+
+        Returns:
+            List of axons in the same order as uids
+        """
+        if self._axons_src is not self.metagraph.axons:
+            axons_np = np.empty(len(self.metagraph.axons), dtype=object)
+            axons_np[:] = self.metagraph.axons
+            self._axons_np = axons_np
+            self._axons_src = self.metagraph.axons
+        return list(self._axons_np[np.asarray(uids, dtype=np.int64)])
+
     async def forward(self, synapse: protocol.ServiceProtocol) -> protocol.ServiceProtocol:
         """
         The forward function is called by the validator every time step.
@@ -66,7 +92,8 @@ class Validator(BaseValidatorNeuron):
         self.set_subtensor()
         self.resync_metagraph()
         
-        bt.logging.debug(f"Validator forward synapse.input: {synapse}")
+        if is_debug_enabled():
+            bt.logging.debug(f"Validator forward synapse.input: {synapse}")
         if synapse.input.get("__type__") == "health":
             bt.logging.info(f"Validator health synapse.input: {synapse.input})")
             synapse.output = {"method": "health", "success": True, "uid": self.uid, "device": self.device}
@@ -98,7 +125,7 @@ class Validator(BaseValidatorNeuron):
             }
             return synapse
 
-        client = ServiceApiClient(self.current_api_key_value)
+        client = self.get_service_client()
 
         picked_uids = []
         from_random = False
@@ -118,13 +145,15 @@ class Validator(BaseValidatorNeuron):
             bt.logging.debug(f"random picked uids: {picked_uids}")
        
         # Filter out validator's own uid and convert to Python int
-        checked_uids = [int(uid) for uid in picked_uids if int(uid) != int(self.uid)]
+        picked_arr = np.asarray(picked_uids, dtype=np.int64)
+        checked_uids = picked_arr[picked_arr != int(self.uid)].tolist()
         if not checked_uids:
             bt.logging.warning("No available nodes found after filtering")
             synapse.output = {"error": "No available nodes found"}
             return synapse
 
-        bt.logging.debug(f"Validator forward uids: {checked_uids}, validator uid: {self.uid}, synapse: {synapse}")
+        if is_debug_enabled():
+            bt.logging.debug(f"Validator forward uids: {checked_uids}, validator uid: {self.uid}, synapse: {synapse}")
         # The dendrite client queries the network with proper timeout handling.
         # responses = []
         # if not from_random:
@@ -155,10 +184,9 @@ class Validator(BaseValidatorNeuron):
 
         # Log the results for monitoring purposes.
         data = {"uids": uids, "responses": responses}
-        bt.logging.debug(
-            f"request node/task/validate: {data}"
-        )
-        bt.logging.debug(f"Debug: picked_uids={picked_uids}, checked_uids={checked_uids}, uids={uids}")
+        if is_debug_enabled():
+            bt.logging.debug(f"request node/task/validate: {data}")
+            bt.logging.debug(f"Debug: picked_uids={picked_uids}, checked_uids={checked_uids}, uids={uids}")
         try:
             result = self.api_post("/sapi/node/task/validate", data)
         except Exception as e:
@@ -207,9 +235,10 @@ class Validator(BaseValidatorNeuron):
         dendrite_task = None
         
         try:
+            axons = self._get_axons(checked_uids)
+
             # Debug axon information
-            for uid in checked_uids:
-                axon = self.metagraph.axons[uid]
+            for uid, axon in zip(checked_uids, axons):
                 bt.logging.debug(f"_check_axon_valid UID {uid} axon: {axon.ip}:{axon.port}, serving: {axon.is_serving}")
             
             # Add timeout and better error handling for dendrite calls
@@ -218,7 +247,7 @@ class Validator(BaseValidatorNeuron):
                 dendrite_task = asyncio.create_task(
                     self.dendrite(
                         # Send the query to selected miner axons in the network.
-                        axons=[self.metagraph.axons[uid] for uid in checked_uids],
+                        axons=axons,
                         # Construct a dummy query. This simply contains a single integer.
                         synapse=synapse,
                         # All responses have the deserialize function called on them before returning.
@@ -312,29 +341,81 @@ class Validator(BaseValidatorNeuron):
         return valid_uids
     
 
-    async def concurrent_forward(self):
-        # For finney network, run forwards sequentially to avoid event loop issues
-        bt.logging.debug(f"Starting concurrent_forward iteration at step {getattr(self, 'step', 'unknown')}")
-        
-        try:
-            # Create a ping request with self UID to identify it as self-initiated
+    def _get_ping_synapse(self, slot: int = 0) -> protocol.ServiceProtocol:
+        """
+        Return the reusable self ping synapse for a forward slot, refreshing its per-iteration fields.
+
+        Args:
+            slot: Index of the concurrent forward the synapse belongs to
+
+        Returns:
+            ServiceProtocol: Ping synapse identifying the request as self-initiated
+        """
+        if self._ping_synapses is None:
+            self._ping_synapses = {}
+        ping_synapse = self._ping_synapses.get(slot)
+        if ping_synapse is None or ping_synapse.input.get("from") != self.uid:
             ping_synapse = protocol.ServiceProtocol(input={
                 "__type__": "ping", 
                 "from": self.uid,
                 "timestamp": time.time(),  # Add timestamp for debugging
                 "source": "concurrent_forward"  # Add source identifier
             })
+            self._ping_synapses[slot] = ping_synapse
+        ping_synapse.input["timestamp"] = time.time()
+        ping_synapse.output = {}
+        return ping_synapse
+
+    async def _forward_worker(self, slot: int, start_delay: float):
+        """Run self-initiated forwards for one slot, each followed by VALIDATOR_SLEEP_TIME, until the validator exits."""
+        await asyncio.sleep(start_delay)
+        while not self.should_exit:
+            try:
+                await self.forward(self._get_ping_synapse(slot))
+                bt.logging.debug(f"Completed concurrent_forward slot {slot} successfully")
+            except Exception as e:
+                bt.logging.error(f"Forward call failed: {e}")
+                # Don't let forward failures stop the worker
+                # Just log and continue
+            await asyncio.sleep(settings.VALIDATOR_SLEEP_TIME)
+
+    def _ensure_forward_workers(self, num_forwards: int):
+        """Start a worker for every forward slot that has none; first starts are staggered across VALIDATOR_SLEEP_TIME."""
+        if self._forward_workers is None:
+            self._forward_workers = {}
+        launch_interval = settings.VALIDATOR_SLEEP_TIME / num_forwards
+        for slot in range(num_forwards):
+            worker = self._forward_workers.get(slot)
+            if worker is None or worker.done():
+                start_delay = slot * launch_interval if worker is None else 0
+                self._forward_workers[slot] = asyncio.create_task(
+                    self._forward_worker(slot, start_delay), name=f"Validator-forward-{slot}"
+                )
+
+    async def _stop_forward_workers(self):
+        """Cancel the forward workers and wait for them, so none is left pending when the event loop closes."""
+        workers = list((self._forward_workers or {}).values())
+        self._forward_workers = None
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def concurrent_forward(self):
+        # neuron.num_concurrent_forwards long-lived workers each loop forward -> sleep on their own, started
+        # staggered, so miners and the business server see a steady stream of requests instead of bursts
+        # separated by idle gaps. With the default of one forward this is sequential.
+        bt.logging.debug(f"Starting concurrent_forward iteration at step {getattr(self, 'step', 'unknown')}")
+        
+        num_forwards = max(1, int(self.config.neuron.num_concurrent_forwards))
+        self._ensure_forward_workers(num_forwards)
             
-            await self.forward(ping_synapse)
-            bt.logging.debug(f"Completed concurrent_forward iteration successfully")
-        except Exception as e:
-            bt.logging.error(f"Forward call failed: {e}")
-            # Don't let forward failures stop the main loop
-            # Just log and continue
-            
-        # Add a delay to reduce event loop pressure on all networks
-        # This also prevents rapid successive calls that could cause loops
+        # The main loop only paces sync() here; the forwards keep running in the workers meanwhile.
+        # This also prevents rapid successive syncs that could cause loops
         await asyncio.sleep(settings.VALIDATOR_SLEEP_TIME)
+        if self.should_exit:
+            await self._stop_forward_workers()
+            return
             
         # More aggressive event loop cleanup to prevent resource leaks
         try:
@@ -4,12 +4,54 @@ Test runner script for the bittensor subnet template.
 This script runs all test files in the tests directory, excluding README and __pycache__.
 """
 
+import argparse
+import subprocess
 import unittest
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def run_tests():
+
+def import_test_module(test_file):
+    """Import a test module from its file path, returning (module, error)."""
+    try:
+        module_name = os.path.relpath(test_file, os.getcwd()).replace('/', '.').replace('.py', '')
+        return __import__(module_name, fromlist=['*']), None
+    except Exception as e:
+        return None, e
+
+def run_test_file_isolated(test_file):
+    """Run one test file in its own interpreter, returning (returncode, output)."""
+    module_name = f"tests.{Path(test_file).stem}"
+    proc = subprocess.run(
+        [sys.executable, "-m", "unittest", "-v", module_name],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+    )
+    return proc.returncode, proc.stdout + proc.stderr
+
+def run_tests_parallel(test_files, jobs):
+    """
+    Run each test file in its own process, up to jobs at a time.
+    The tests mostly wait on chain RPCs (metagraph syncs), so the files overlap well, and every
+    process opens its own subtensor websocket instead of sharing one.
+    """
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(executor.map(run_test_file_isolated, test_files))
+    
+    failed = 0
+    for test_file, (returncode, output) in zip(test_files, results):
+        print(f"\n===== {test_file} =====")
+        print(output)
+        if returncode != 0:
+            failed += 1
+    
+    print(f"{len(test_files) - failed}/{len(test_files)} test files passed")
+    return 0 if failed == 0 else 1
+
+def run_tests(jobs=1):
     """Discover and run all tests in the tests directory."""
     # Get the tests directory
     tests_dir = Path(__file__).parent / "tests"
@@ -24,18 +66,23 @@ def run_tests():
     for test_file in test_files:
         print(f"  - {test_file}")
     
+    if jobs > 1 and len(test_files) > 1:
+        return run_tests_parallel(test_files, jobs)
+    
     # Create test suite
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
     
-    # Load tests from each file
-    for test_file in test_files:
+    # Import the test modules concurrently to overlap import I/O
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        imported = list(executor.map(import_test_module, test_files))
+    
+    # Load tests from each module on the main thread, TestLoader is not thread-safe
+    for test_file, (module, error) in zip(test_files, imported):
+        if error is not None:
+            print(f"Error loading tests from {test_file}: {error}")
+            continue
         try:
-            # Import the test module
-            module_name = os.path.relpath(test_file, os.getcwd()).replace('/', '.').replace('.py', '')
-            module = __import__(module_name, fromlist=['*'])
-            
-            # Load tests from the module
             tests = loader.loadTestsFromModule(module)
             suite.addTests(tests)
             print(f"Loaded tests from {test_file}")
@@ -50,4 +97,13 @@ def run_tests():
     return 0 if result.wasSuccessful() else 1
 
 if __name__ == "__main__":
-    sys.exit(run_tests()) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        # Leave two cores for the rest of the machine
+        default=max(1, (os.cpu_count() or 1) - 2),
+        help="Number of test files to run in parallel, 1 runs everything in this process",
+    )
+    args = parser.parse_args()
+    sys.exit(run_tests(jobs=args.jobs))
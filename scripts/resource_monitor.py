@@ -44,6 +44,8 @@ class ResourceMonitor:
         }
         self.cleanup_interval = 300  # 5 minutes
         self.last_cleanup = 0
+        self.slow_cleanup_interval = 3600  # 1 hour, file cleanup and os.sync() are expensive
+        self.last_slow_cleanup = 0
         
         # Register signal handlers
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -73,7 +75,7 @@ class ResourceMonitor:
                 fd_count = len(psutil.Process().open_files())
             
             # Network connections
-            connections = len(psutil.net_connections())
+            connections = self._count_connections()
             
             # Process count
             process_count = len(psutil.pids())
@@ -92,6 +94,25 @@ class ResourceMonitor:
             logger.error(f"Error getting system stats: {e}")
             return {}
     
+    def _count_connections(self) -> int:
+        """Count in-use TCP/UDP sockets from the kernel's precomputed counters"""
+        try:
+            connections = 0
+            for sockstat in ('/proc/net/sockstat', '/proc/net/sockstat6'):
+                if not os.path.exists(sockstat):
+                    continue
+                with open(sockstat, 'r') as f:
+                    for line in f:
+                        # e.g. "TCP: inuse 12 orphan 0 tw 3 alloc 15 mem 2" / "TCP6: inuse 4"
+                        proto, _, fields = line.partition(':')
+                        if proto in ('TCP', 'UDP', 'TCP6', 'UDP6'):
+                            fields = fields.split()
+                            connections += int(fields[fields.index('inuse') + 1])
+            return connections
+        except (FileNotFoundError, PermissionError, ValueError):
+            # Fallback for systems without /proc, walks every socket
+            return len(psutil.net_connections())
+    
     def check_resource_thresholds(self, stats: Dict) -> List[str]:
         """Check if any resource thresholds are exceeded"""
         warnings = []
@@ -110,50 +131,42 @@ class ResourceMonitor:
         
         return warnings
     
-    def perform_cleanup(self):
+    def perform_cleanup(self, stats: Optional[Dict] = None):
         """Perform system cleanup operations"""
         logger.info("Performing system cleanup...")
         
         try:
-            # Force garbage collection
-            collected = gc.collect()
-            logger.info(f"Garbage collected {collected} objects")
-            
-            # Clean up Python cache
-            self._cleanup_python_cache()
+            self.fast_cleanup(stats or {})
             
-            # Clean up temporary files
-            self._cleanup_temp_files()
-            
-            # Clean up old log files
-            self._cleanup_old_logs()
-            
-            # Force sync to disk
-            os.sync()
+            current_time = time.time()
+            if (current_time - self.last_slow_cleanup) > self.slow_cleanup_interval:
+                self.slow_cleanup()
+                self.last_slow_cleanup = current_time
             
             logger.info("Cleanup completed successfully")
             
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
     
-    def _cleanup_python_cache(self):
-        """Clean up Python cache files"""
-        try:
-            import shutil
-            cache_dirs = [
-                '/app/__pycache__',
-                '/app/services/__pycache__',
-                '/app/neurons/__pycache__',
-                '/app/template/__pycache__',
-                '/app/manage/__pycache__'
-            ]
-            
-            for cache_dir in cache_dirs:
-                if os.path.exists(cache_dir):
-                    shutil.rmtree(cache_dir)
-                    logger.debug(f"Removed cache directory: {cache_dir}")
-        except Exception as e:
-            logger.error(f"Error cleaning Python cache: {e}")
+    def fast_cleanup(self, stats: Dict):
+        """In-process cleanup, cheap enough to run on every threshold trip"""
+        # Only pay for a full collection when memory pressure is real
+        if stats.get('memory_percent', 0) > self.cleanup_thresholds['memory_percent']:
+            collected = gc.collect(2)
+        else:
+            collected = gc.collect(1)
+        logger.info(f"Garbage collected {collected} objects")
+    
+    def slow_cleanup(self):
+        """Filesystem cleanup, rate limited by slow_cleanup_interval since os.sync() blocks on a full disk flush"""
+        # Clean up temporary files
+        self._cleanup_temp_files()
+        
+        # Clean up old log files
+        self._cleanup_old_logs()
+        
+        # Force sync to disk
+        os.sync()
     
     def _cleanup_temp_files(self):
         """Clean up temporary files"""
@@ -242,7 +255,7 @@ class ResourceMonitor:
                 )
                 
                 if should_cleanup:
-                    self.perform_cleanup()
+                    self.perform_cleanup(stats)
                     self.last_cleanup = current_time
                 
                 # Sleep for 60 seconds
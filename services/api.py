@@ -1,110 +1,212 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import orjson
 from .config import settings
 import socket
 from template import __spec_version__ as spec_version
 import logging
 import atexit
+import threading
+import time
 import weakref
 
 
 logger = logging.getLogger(__name__)
 
+# orjson options matching what the stdlib json encoder accepted from callers (numpy scalars, int dict keys)
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Process-wide sessions keyed by pool size. One httpx.Client keeps a connection pool per origin,
+# so every client shares its transport and keep-alive HTTP/2 connections instead of building its own.
+_SESSION_CACHE: dict = {}
+_SESSION_LOCK = threading.Lock()
+
+# Responses retried with exponential backoff, matching the former urllib3 Retry policy
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+MAX_RETRIES = 3
+MAX_RETRY_DELAY = 8
+
+
+def _retry_delay(response, attempt):
+    """Seconds to wait before retrying response: the server's Retry-After if given, else 2**attempt, capped"""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return min(int(retry_after), MAX_RETRY_DELAY)
+    return min(2 ** attempt, MAX_RETRY_DELAY)
+
+
+def _pool_limits(pool_maxsize):
+    """httpx pool limits for a shared session: pool_maxsize connections, all of them kept alive"""
+    import httpx
+
+    return httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+
+
+def _get_session(pool_maxsize):
+    """Return the shared httpx.Client for pool_maxsize, creating it on first use."""
+    key = pool_maxsize
+    session = _SESSION_CACHE.get(key)
+    if session is not None:
+        return session
+
+    with _SESSION_LOCK:
+        session = _SESSION_CACHE.get(key)
+        if session is None:
+            # Imported lazily: many importers of this module never open a connection
+            import httpx
+
+            # HTTP/2 multiplexes the validator's concurrent requests over one connection.
+            # The pool is sized for the fan-out and requests wait for a free slot when it is
+            # exhausted; the transport retries failed connects, status retries are in _request.
+            # httpx ignores Client(limits=...) when a transport is given, so the limits go on the transport.
+            # Redirects are followed like the former requests session did.
+            session = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                transport=httpx.HTTPTransport(http2=True, retries=MAX_RETRIES, limits=_pool_limits(pool_maxsize)),
+            )
+            _SESSION_CACHE[key] = session
+    return session
+
+
+def close_all_sessions():
+    """Close every shared session and its pooled connections"""
+    with _SESSION_LOCK:
+        sessions = list(_SESSION_CACHE.values())
+        _SESSION_CACHE.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception as e:
+            logger.error(f"Error closing HTTP session: {e}")
+    logger.debug("HTTP client sessions closed")
+
+
+
+# Local IP found by get_local_ip(); only successful lookups are kept
+_local_ip = None
+
+
 def get_local_ip():
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    """Return the local IP used to reach DETECT_IP. The route does not change at runtime, so it is resolved once.
+
+    Failures return 127.0.0.1 without being remembered, so a transient error is retried on the next call.
+    """
+    global _local_ip
+    if _local_ip is not None:
+        return _local_ip
     try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    except OSError:
+        # e.g. IPv6-only host without AF_INET support
+        return '127.0.0.1'
+    try:
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # A UDP connect() sends no packet; the kernel just picks the outbound route
         s.connect((settings.DETECT_IP, 80))
-        ip = s.getsockname()[0]
+        _local_ip = s.getsockname()[0]
+        return _local_ip
+    except socket.gaierror as e:
+        # DETECT_IP is a hostname that did not resolve
+        logger.warning(f"Could not resolve DETECT_IP {settings.DETECT_IP}: {e}")
+        return '127.0.0.1'
     except Exception:
-        ip = '127.0.0.1'
+        return '127.0.0.1'
     finally:
         s.close()
-    return ip
 
 class HttpClient:
-    def __init__(self, base_url, timeout=10, authorization=None):
+    # Live clients, tracked weakly so short-lived clients can still be collected
+    _instances = weakref.WeakSet()
+
+    def __init__(self, base_url, timeout=10, authorization=None, pool_maxsize=None):
         self.base_url = base_url.rstrip('/')
+        self._base = self.base_url + '/'
         self.timeout = timeout
         self.default_headers = {}
         if authorization:
             self.default_headers['Authorization'] = authorization
+        # Headers for JSON posts, built once so the common no-extra-headers call allocates nothing
+        self._json_headers = {**self.default_headers, 'Content-Type': 'application/json'}
         
-        # Create session with connection pooling and retry strategy
-        self.session = requests.Session()
-        
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE", "POST"]
-        )
-        
-        # Configure adapter with connection pooling
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=10,  # Number of connection pools
-            pool_maxsize=20,      # Maximum number of connections in pool
-            pool_block=False      # Don't block when pool is full
-        )
-        
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        
-        # Register cleanup function
-        atexit.register(self.close)
+        # Shared session with connection pooling and retry strategy, closed at exit
+        self.pool_maxsize = pool_maxsize or settings.HTTP_POOL_MAXSIZE
+        self.session = _get_session(self.pool_maxsize)
         
         # Track instances for cleanup
-        if not hasattr(HttpClient, '_instances'):
-            HttpClient._instances = weakref.WeakSet()
         HttpClient._instances.add(self)
 
+    def set_authorization(self, authorization):
+        """Swap the Authorization header in place; the pooled session and its connections are kept"""
+        default_headers = {k: v for k, v in self.default_headers.items() if k != 'Authorization'}
+        if authorization:
+            default_headers['Authorization'] = authorization
+        # Assign fresh dicts so concurrent requests see either the old or the new headers, never a mix
+        self._json_headers = {**default_headers, 'Content-Type': 'application/json'}
+        self.default_headers = default_headers
+
+    def _url(self, endpoint):
+        return self._base + (endpoint.lstrip('/') if endpoint.startswith('/') else endpoint)
+
+    def _request(self, method, url, **kwargs):
+        """Send a request, retrying RETRY_STATUSES responses with exponential backoff"""
+        for attempt in range(MAX_RETRIES + 1):
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            time.sleep(_retry_delay(response, attempt))
+
     def get(self, endpoint, params=None, headers=None):
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        merged_headers = self.default_headers.copy()
-        if headers:
-            merged_headers.update(headers)
+        url = self._url(endpoint)
+        merged_headers = {**self.default_headers, **headers} if headers else self.default_headers
         try:
-            response = self.session.get(url, params=params, headers=merged_headers, timeout=self.timeout)
+            response = self._request("GET", url, params=params, headers=merged_headers)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             logger.error(f"HTTP GET error for {url}: {e}")
             return {"error": str(e)}
 
     def post(self, endpoint, data=None, json=None, headers=None):
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        merged_headers = self.default_headers.copy()
-        if headers:
-            merged_headers.update(headers)
+        url = self._url(endpoint)
+        base_headers = self.default_headers if json is None else self._json_headers
+        merged_headers = {**base_headers, **headers} if headers else base_headers
         try:
-            response = self.session.post(url, data=data, json=json, headers=merged_headers, timeout=self.timeout)
+            content = None
+            if json is not None:
+                content = orjson.dumps(json, option=ORJSON_OPTIONS)
+            elif isinstance(data, (bytes, str)):
+                content, data = data, None
+            response = self._request("POST", url, content=content, data=data, headers=merged_headers)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             return data
         except Exception as e:
             logger.error(f"HTTP POST error for {url}: {e}")
             return {"error": str(e)}
     
     def close(self):
-        """Close the session and all connections"""
-        try:
-            if hasattr(self, 'session'):
-                self.session.close()
-                logger.debug("HTTP client session closed")
-        except Exception as e:
-            logger.error(f"Error closing HTTP client session: {e}")
+        """Release this client. The underlying session is shared and closed by close_all_sessions()"""
+        self.session = None
     
     @classmethod
     def cleanup_all(cls):
-        """Cleanup all HttpClient instances"""
-        if hasattr(cls, '_instances'):
-            for instance in list(cls._instances):
-                instance.close()
-            cls._instances.clear()
+        """Cleanup all HttpClient instances and the shared sessions"""
+        for instance in list(HttpClient._instances):
+            instance.close()
+        HttpClient._instances.clear()
+        close_all_sessions()
+
+
+# One exit hook for all clients instead of one per instance
+atexit.register(HttpClient.cleanup_all)
 
 
 class ServiceApiClient(HttpClient):
     def __init__(self, token:str, timeout=10):
         super().__init__(settings.SRV_API_URL, timeout, authorization=f"Bearer {token}")
+        self.token = token
+
+    def set_token(self, token: str):
+        """Rotate the bearer token without creating a new client"""
+        if token != self.token:
+            self.set_authorization(f"Bearer {token}")
+            self.token = token
@@ -1,16 +1,85 @@
 import subprocess
 import json
-import pexpect
 import re
 import logging
 
 
 logger = logging.getLogger(__name__)
 
+# match all ANSI escape sequences
+_ANSI_RE = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
+_JSON_DECODER = json.JSONDecoder()
+
 def remove_ansi_escape(s):
-    # match all ANSI escape sequences
-    ansi_escape = re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]')
-    return ansi_escape.sub('', s)
+    return _ANSI_RE.sub('', s)
+
+def extract_first_json(output):
+    """Return the first complete {...} JSON block in output (may span multiple lines).
+
+    Scans forward with JSONDecoder.raw_decode from each '{', which is linear and stops at the
+    first object instead of regex-matching up to the last '}' and re-parsing.
+    """
+    start = idx = output.find('{')
+    while idx != -1:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(output, idx)
+            return obj
+        except json.JSONDecodeError:
+            idx = output.find('{', idx + 1)
+    if start == -1:
+        # if no JSON output found
+        return {"error": "No JSON output found", "output": output}
+    logger.error("JSON decode failed: no complete JSON object in output")
+    return {"error": "Invalid JSON output", "json_str": output[start:]}
+
+# Set once a piped btcli run shows that the installed btcli only prompts on a real TTY
+_btcli_needs_tty = False
+
+# Output of a btcli run that could not read its prompts without a terminal
+_TTY_FAILURE_RE = re.compile(
+    r"not a tty|inappropriate ioctl for device|termios\.error|/dev/tty|EOFError", re.IGNORECASE
+)
+# Output of a btcli run that got past the password prompt and may have submitted the stake
+_CHAIN_REACHED_RE = re.compile(r"decrypting|extrinsic|submitting|finaliz|included in block", re.IGNORECASE)
+
+def _needs_tty_fallback(returncode, output, result):
+    """True if a piped btcli run failed only because it needed a TTY for its prompts.
+
+    Other failures (wrong password, chain errors) are returned as they are: retrying them under a
+    PTY would not help, and a run that reached the chain must never be submitted a second time.
+    """
+    if returncode == 0 or result.get("error") != "No JSON output found":
+        return False
+    return bool(_TTY_FAILURE_RE.search(output)) and not _CHAIN_REACHED_RE.search(output)
+
+def _run_btcli_piped(cmd, password, timeout=60):
+    """Run btcli with the confirm + password answers fed on stdin. Returns (returncode, output)."""
+    # A new session has no controlling terminal, so getpass falls back to reading stdin
+    proc = subprocess.run(
+        cmd,
+        input=f"y\n{password}\n",
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        timeout=timeout,
+        start_new_session=True,
+    )
+    return proc.returncode, proc.stdout
+
+def _run_btcli_pty(cmd, password, timeout=60):
+    """Run btcli under a PTY with pexpect, answering the confirm and password prompts."""
+    # pexpect pulls in ptyprocess/pty at import time; only pay for it when a TTY is required
+    import pexpect
+
+    child = pexpect.spawn(" ".join(cmd), encoding="utf-8")
+    child.expect('Would you like to continue?')
+    child.sendline('y')
+    child.expect('Enter your password:')
+    child.sendline(password)
+    child.expect(pexpect.EOF, timeout=timeout)
+    output = child.before
+    child.close()
+    return output
 
 def stake_add(wallet_name, hotkey, amount, netuid, password, chain_endpoint=None, network=None, partial=False):
     if not wallet_name or not hotkey or not amount or not netuid or not password:
@@ -19,6 +88,8 @@ def stake_add(wallet_name, hotkey, amount, netuid, password, chain_endpoint=None
     if not network and not chain_endpoint:
         raise ValueError("network or chain_endpoint is required")
     
+    global _btcli_needs_tty
+
     try:
         cmd = [
             "btcli", "stake", "add",
@@ -39,29 +110,23 @@ def stake_add(wallet_name, hotkey, amount, netuid, password, chain_endpoint=None
             cmd.append("--partial")
 
         logger.debug(f"cmd: {' '.join(cmd)}")
-        child = pexpect.spawn(" ".join(cmd), encoding="utf-8")
-        child.expect('Would you like to continue?')
-        child.sendline('y')
-        child.expect('Enter your password:')
-        child.sendline(password)
-        child.expect(pexpect.EOF, timeout=60)
-        output = child.before
-        child.close()
+        if not _btcli_needs_tty:
+            returncode, output = _run_btcli_piped(cmd, password)
+            logger.debug(f"stake result: {output}")
+            output = remove_ansi_escape(output)
+            result = extract_first_json(output)
+            if not _needs_tty_fallback(returncode, output, result):
+                if returncode != 0 and result.get("error") == "No JSON output found":
+                    result["error"] = f"btcli exited with code {returncode}"
+                return result
+            logger.warning("btcli did not accept piped input, falling back to a PTY")
+            _btcli_needs_tty = True
 
+        output = _run_btcli_pty(cmd, password)
         logger.debug(f"stake result: {output}")
         output = remove_ansi_escape(output)
 
-        # use regex to extract the first complete {...} JSON block (supports multiple lines)
-        json_match = re.search(r'(\{[\s\S]*\})', output)
-        if json_match:
-            json_str = json_match.group(1)
-            try:
-                return json.loads(json_str)
-            except Exception as e:
-                logger.error(f"JSON decode failed: {e}")
-                return {"error": "Invalid JSON output", "json_str": json_str}
-        # if no JSON output found
-        return {"error": "No JSON output found", "output": output}
+        return extract_first_json(output)
 
     except Exception as e:
         logger.error(f"stake failed: {e}")
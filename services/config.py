@@ -1,6 +1,9 @@
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
-from pydantic_settings import BaseSettings
+from typing import Optional
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 import logging
 
 # Get the project root directory (parent of services directory)
@@ -9,31 +12,40 @@ env_file_path = os.path.join(project_root, ".env")
 load_dotenv(env_file_path, override=True)
 
 class Settings(BaseSettings):
-    DETECT_IP: str = os.getenv("DETECT_IP", "8.8.8.8")
-    SRV_API_URL: str = os.getenv("SRV_API_URL", "https://api.taoillium.ai")
-    SRV_API_KEY: str = os.getenv("SRV_API_KEY", '')
-
-    NEURON_JWT_SECRET_KEY: str = os.getenv("NEURON_JWT_SECRET_KEY")
-    NEURON_JWT_EXPIRE_IN: int = int(os.getenv("NEURON_JWT_EXPIRE_IN", "30"))
-    NEURON_JWT_ALGORITHM: str = os.getenv("NEURON_JWT_ALGORITHM", "HS256")
-
-    CHAIN_NETWORK: str = os.getenv("CHAIN_NETWORK", "local")
-    CHAIN_ENDPOINT: str = os.getenv("CHAIN_ENDPOINT", "")
-    WALLET_NAME: str = os.getenv("WALLET_NAME", "validator")
-    HOTKEY_NAME: str = os.getenv("HOTKEY_NAME", "default")
+    # Values come from the environment (populated from .env above) and are parsed by pydantic-settings
+    DETECT_IP: str = "8.8.8.8"
+    SRV_API_URL: str = "https://api.taoillium.ai"
+    SRV_API_KEY: str = ''
+    HTTP_POOL_MAXSIZE: int = max(32, (os.cpu_count() or 1) * 4)
+
+    NEURON_JWT_SECRET_KEY: Optional[str] = None
+    NEURON_JWT_EXPIRE_IN: int = 30
+    NEURON_JWT_ALGORITHM: str = "HS256"
+
+    CHAIN_NETWORK: str = "local"
+    CHAIN_ENDPOINT: str = ""
+    WALLET_NAME: str = "validator"
+    HOTKEY_NAME: str = "default"
     
-    CHAIN_NETUID: int = int(os.getenv("CHAIN_NETUID", "2"))
-    VALIDATOR_SLEEP_TIME: int = int(os.getenv("VALIDATOR_SLEEP_TIME", "5"))
-    MINER_SLEEP_TIME: int = int(os.getenv("MINER_SLEEP_TIME", "5"))
+    CHAIN_NETUID: int = 2
+    VALIDATOR_SLEEP_TIME: int = 5
+    MINER_SLEEP_TIME: int = 5
 
     # Manager service configuration
-    MANAGER_HOST: str = os.getenv("MANAGER_HOST", "0.0.0.0")
-    MANAGER_PORT: int = int(os.getenv("MANAGER_PORT", "8000"))
-    MANAGER_DEBUG: str = os.getenv("MANAGER_DEBUG", "INFO").upper()
-    MANAGER_RELOAD: bool = os.getenv("MANAGER_RELOAD", "false").lower() == "true"
-    MANAGER_JWT_SECRET_KEY: str = os.getenv("MANAGER_JWT_SECRET_KEY", "your-secret-api-key")
-    MANAGER_JWT_EXPIRE_IN: int = int(os.getenv("MANAGER_JWT_EXPIRE_IN", "30"))
-    MANAGER_JWT_ALGORITHM: str = os.getenv("MANAGER_JWT_ALGORITHM", "HS256")
+    MANAGER_HOST: str = "0.0.0.0"
+    MANAGER_PORT: int = 8000
+    MANAGER_DEBUG: str = "INFO"
+    MANAGER_RELOAD: bool = False
+    MANAGER_JWT_SECRET_KEY: str = "your-secret-api-key"
+    MANAGER_JWT_EXPIRE_IN: int = 30
+    MANAGER_JWT_ALGORITHM: str = "HS256"
+
+    model_config = SettingsConfigDict(env_file=env_file_path, case_sensitive=True, extra="allow")
+
+    @field_validator("MANAGER_DEBUG")
+    @classmethod
+    def _upper_log_level(cls, value: str) -> str:
+        return value.upper()
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -47,47 +59,70 @@ class Settings(BaseSettings):
             
             self.CHAIN_ENDPOINT = default_chain_endpoint
 
-    class Config:
-        case_sensitive = True
-        env_file = ".env"
-        extra = "allow"
-
     
     def record_api_key_to_env(self, key, value):
-        """Record the current API key to .env file"""
+        """Record the current API key to .env file.
+
+        Called once, from the shutdown signal handler right before the process exits, so the
+        file is written synchronously.
+        """
         if not key or not value:
             print(f"No API key to record: key={key}, value={'*' * len(value) if value else 'None'}")
             return
 
         try:
-            # Read existing .env file
-            env_lines = []
-            key_found = False
-            
             if os.path.exists(env_file_path):
-                with open(env_file_path, 'r') as f:
-                    env_lines = f.readlines()
-                
-                # Check if the key already exists
-                for i, line in enumerate(env_lines):
-                    if line.strip().startswith(f"{key}="):
-                        env_lines[i] = f"{key}={value}\n"
-                        key_found = True
-                        break
-                
-                # If key not found, add it
-                if not key_found:
-                    env_lines.append(f"{key}={value}\n")
-                
-                # Write back to .env file
-                with open(env_file_path, 'w') as f:
-                    f.writelines(env_lines)
-                
+                with open(env_file_path, 'rb') as f:
+                    data = f.read()
+                _write_env_file(_splice_env_line(data, key, value))
+
                 # Log success
                 print(f"Recorded {key} to .env file")
-                
+
         except Exception as e:
             # Log error
             print(f"Failed to record API key to .env file: {e}")
 
-settings = Settings() 
\ No newline at end of file
+
+def _splice_env_line(data: bytes, key: str, value: str) -> bytes:
+    """Replace an existing "KEY=" line in data with the new value, or append one"""
+    prefix = f"{key}=".encode()
+    new_line = f"{key}={value}\n".encode()
+    start = 0 if data.startswith(prefix) else data.find(b"\n" + prefix)
+    if start == -1:
+        separator = b"" if not data or data.endswith(b"\n") else b"\n"
+        return data + separator + new_line
+    if start:
+        start += 1
+    end = data.find(b"\n", start)
+    end = len(data) if end == -1 else end + 1
+    return data[:start] + new_line + data[end:]
+
+
+def _write_env_file(data: bytes):
+    """Atomically replace the .env file with data.
+
+    Writes a sibling temp file and os.replace()s it, so a crash mid-write never leaves a truncated
+    .env. When .env is a bind-mounted file (docker-compose) it cannot be renamed over, so the
+    content is written in place instead.
+    """
+    tmp_path = env_file_path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, env_file_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        with open(env_file_path, 'wb') as f:
+            f.write(data)
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance, built (and .env parsed) on first call only."""
+    return Settings()
+
+
+settings = get_settings() 
\ No newline at end of file
@@ -1,9 +1,70 @@
-from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
 from typing import Optional
+import json
+import threading
 import jwt
+from jwt.algorithms import get_default_algorithms
+from jwt.utils import base64url_encode
 import time
 from services.config import settings
 
+# Recently verified tokens: (algorithm, secret_key, token) -> (payload, cached_until).
+# Tokens are reused until they expire, so repeat verifications skip the HMAC and base64 decode.
+_VERIFIED_TOKENS_MAXSIZE = 1024
+_VERIFIED_TOKENS_TTL = 30
+_verified_tokens: OrderedDict = OrderedDict()
+_verified_tokens_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _get_signer(algorithm: str, secret_key: str):
+    """Return the algorithm, prepared key and encoded header for (algorithm, secret_key).
+
+    Resolving the algorithm, preparing the key and serializing the header are the same for
+    every token, so they are done once instead of inside each jwt.encode call.
+    """
+    alg = get_default_algorithms()[algorithm]
+    key = alg.prepare_key(secret_key)
+    header = json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":"), sort_keys=True).encode()
+    return alg, key, base64url_encode(header)
+
+
+def _encode_token(payload: dict, secret_key: str, algorithm: str) -> str:
+    """Encode payload as a JWT, equivalent to jwt.encode with a cached signer."""
+    alg, key, header_b64 = _get_signer(algorithm, secret_key)
+    payload_b64 = base64url_encode(json.dumps(payload, separators=(",", ":")).encode())
+    signing_input = header_b64 + b"." + payload_b64
+    signature = alg.sign(signing_input, key)
+    return (signing_input + b"." + base64url_encode(signature)).decode()
+
+
+def _decode_token(token: str, secret_key: str, algorithm: str) -> dict:
+    """jwt.decode with a small TTL cache of successful verifications, bounded by the token's exp."""
+    if token.startswith("Bearer "):
+        token = token[7:]
+    key = (algorithm, secret_key, token)
+    now = time.time()
+    with _verified_tokens_lock:
+        entry = _verified_tokens.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                _verified_tokens.move_to_end(key)
+                return dict(entry[0])
+            del _verified_tokens[key]
+
+    payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+    cached_until = now + _VERIFIED_TOKENS_TTL
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        cached_until = min(cached_until, exp)
+    with _verified_tokens_lock:
+        _verified_tokens[key] = (payload, cached_until)
+        if len(_verified_tokens) > _VERIFIED_TOKENS_MAXSIZE:
+            _verified_tokens.popitem(last=False)
+    return dict(payload)
+
 
 def create_neuron_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a new JWT access token.
@@ -16,15 +77,14 @@ def create_neuron_access_token(data: dict, expires_delta: Optional[timedelta] =
         str: The encoded JWT token.
     """
     to_encode = data.copy()
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.NEURON_JWT_EXPIRE_IN)
-    to_encode.update({"salt": time.time()})
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.NEURON_JWT_SECRET_KEY, algorithm=settings.NEURON_JWT_ALGORITHM)
-    token = verify_neuron_token(encoded_jwt)
-    return {"token": encoded_jwt, "exp": token.get("exp")}
+        expire = now + settings.NEURON_JWT_EXPIRE_IN * 60
+    to_encode.update({"salt": time.time_ns(), "iat": now, "exp": expire})
+    encoded_jwt = _encode_token(to_encode, settings.NEURON_JWT_SECRET_KEY, settings.NEURON_JWT_ALGORITHM)
+    return {"token": encoded_jwt, "exp": expire}
 
 def verify_neuron_token(token: str) -> Optional[dict]:
     """Verify a JWT token.
@@ -36,9 +96,7 @@ def verify_neuron_token(token: str) -> Optional[dict]:
         Optional[dict]: The decoded token payload if valid, None otherwise.
     """
     try:
-        if token.startswith("Bearer "):
-            token = token[7:]
-        payload = jwt.decode(token, settings.NEURON_JWT_SECRET_KEY, algorithms=[settings.NEURON_JWT_ALGORITHM])
+        payload = _decode_token(token, settings.NEURON_JWT_SECRET_KEY, settings.NEURON_JWT_ALGORITHM)
         return payload
     except Exception as e:
         print(f"Error verifying token: {e}")
@@ -56,12 +114,13 @@ def create_manage_access_token(data: dict, expires_delta: Optional[timedelta] =
         str: The encoded JWT token.
     """
     to_encode = data.copy()
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=settings.MANAGER_JWT_EXPIRE_IN)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.MANAGER_JWT_SECRET_KEY, algorithm=settings.MANAGER_JWT_ALGORITHM)
+        expire = now + settings.MANAGER_JWT_EXPIRE_IN * 60
+    to_encode.update({"iat": now, "exp": expire})
+    encoded_jwt = _encode_token(to_encode, settings.MANAGER_JWT_SECRET_KEY, settings.MANAGER_JWT_ALGORITHM)
     return encoded_jwt
 
 def verify_manage_token(token: str) -> Optional[dict]:
@@ -74,9 +133,7 @@ def verify_manage_token(token: str) -> Optional[dict]:
         Optional[dict]: The decoded token payload if valid, None otherwise.
     """
     try:
-        if token.startswith("Bearer "):
-            token = token[7:]
-        payload = jwt.decode(token, settings.MANAGER_JWT_SECRET_KEY, algorithms=[settings.MANAGER_JWT_ALGORITHM])
+        payload = _decode_token(token, settings.MANAGER_JWT_SECRET_KEY, settings.MANAGER_JWT_ALGORITHM)
         return payload
     except Exception as e:
         print(f"Error verifying token: {e}")
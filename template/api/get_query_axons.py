@@ -44,16 +44,16 @@ async def ping_uids(dendrite, metagraph, uids, timeout=3):
             deserialize=False,
             timeout=timeout,
         )
-        successful_uids = [
-            uid
-            for uid, response in zip(uids, responses)
-            if response.dendrite.status_code == 200
-        ]
-        failed_uids = [
-            uid
-            for uid, response in zip(uids, responses)
-            if response.dendrite.status_code != 200
-        ]
+        # One pass over the responses, then split the UIDs with a boolean mask
+        codes = np.fromiter(
+            (response.dendrite.status_code or 0 for response in responses),
+            dtype=np.int32,
+            count=len(responses),
+        )
+        ok = codes == 200
+        uids_arr = np.asarray(uids, dtype=np.int64)
+        successful_uids = uids_arr[ok].tolist()
+        failed_uids = uids_arr[~ok].tolist()
     except Exception as e:
         bt.logging.error(f"Dendrite ping failed: {e}")
         successful_uids = []
@@ -63,7 +63,28 @@ async def ping_uids(dendrite, metagraph, uids, timeout=3):
     return successful_uids, failed_uids
 
 
-async def get_query_api_nodes(dendrite, metagraph, n=0.1, timeout=3):
+def get_stake_candidate_uids(metagraph, n=0.1):
+    """
+    Returns the UIDs in the top n fraction by stake that also have validator trust.
+
+    Args:
+        metagraph (bittensor.metagraph): The metagraph instance containing network information.
+        n (float, optional): The fraction of top nodes to consider based on stake. Defaults to 0.1.
+
+    Returns:
+        list: Candidate UIDs to ping as API nodes.
+    """
+    stake = np.asarray(metagraph.S, dtype=np.float64)
+    if stake.size == 0:
+        return []
+    # Top k by stake with an O(N) partial selection instead of a full sort/quantile
+    k = min(max(1, int(n * stake.size)), stake.size)
+    top_uids = np.argpartition(-stake, k - 1)[:k]
+    vtrust = np.asarray(metagraph.validator_trust, dtype=np.float64)
+    return top_uids[vtrust[top_uids] > 0].tolist()
+
+
+async def get_query_api_nodes(dendrite, metagraph, n=0.1, timeout=3, candidate_uids=None):
     """
     Fetches the available API nodes to query for the particular subnet.
 
@@ -72,6 +93,7 @@ async def get_query_api_nodes(dendrite, metagraph, n=0.1, timeout=3):
         metagraph (bittensor.metagraph): The metagraph instance containing network information.
         n (float, optional): The fraction of top nodes to consider based on stake. Defaults to 0.1.
         timeout (int, optional): The timeout in seconds for pinging nodes. Defaults to 3.
+        candidate_uids (list, optional): Precomputed get_stake_candidate_uids() result to ping. Defaults to None.
 
     Returns:
         list: A list of UIDs representing the available API nodes.
@@ -79,17 +101,10 @@ async def get_query_api_nodes(dendrite, metagraph, n=0.1, timeout=3):
     bt.logging.debug(
         f"Fetching available API nodes for subnet {metagraph.netuid}"
     )
-    vtrust_uids = [
-        uid.item()
-        for uid in metagraph.uids
-        if metagraph.validator_trust[uid] > 0
-    ]
-    top_uids = np.where(metagraph.S > np.quantile(metagraph.S, 1 - n))[
-        0
-    ].tolist()
-    init_query_uids = set(top_uids).intersection(set(vtrust_uids))
+    if candidate_uids is None:
+        candidate_uids = get_stake_candidate_uids(metagraph, n=n)
     query_uids, _ = await ping_uids(
-        dendrite, metagraph, list(init_query_uids), timeout=timeout
+        dendrite, metagraph, list(candidate_uids), timeout=timeout
     )
     bt.logging.debug(
         f"Available API node UIDs for subnet {metagraph.netuid}: {query_uids}"
@@ -100,7 +115,7 @@ async def get_query_api_nodes(dendrite, metagraph, n=0.1, timeout=3):
 
 
 async def get_query_api_axons(
-    wallet, metagraph=None, n=0.1, timeout=3, uids=None
+    wallet, metagraph=None, n=0.1, timeout=3, uids=None, candidate_uids=None, dendrite=None
 ):
     """
     Retrieves the axons of query API nodes based on their availability and stake.
@@ -111,11 +126,14 @@ async def get_query_api_axons(
         n (float, optional): The fraction of top nodes to consider based on stake. Defaults to 0.1.
         timeout (int, optional): The timeout in seconds for pinging nodes. Defaults to 3.
         uids (Union[List[int], int], optional): The specific UID(s) of the API node(s) to query. Defaults to None.
+        candidate_uids (list, optional): Precomputed stake candidates passed to get_query_api_nodes. Defaults to None.
+        dendrite (bittensor.dendrite, optional): Long-lived dendrite to ping with, reusing its connections. Defaults to a new one.
 
     Returns:
         list: A list of axon objects for the available API nodes.
     """
-    dendrite = bt.dendrite(wallet=wallet)
+    if dendrite is None:
+        dendrite = bt.dendrite(wallet=wallet)
 
     if metagraph is None:
         # Create config for metagraph with proper chain endpoint
@@ -136,6 +154,6 @@ async def get_query_api_axons(
         query_uids = [uids] if isinstance(uids, int) else uids
     else:
         query_uids = await get_query_api_nodes(
-            dendrite, metagraph, n=n, timeout=timeout
+            dendrite, metagraph, n=n, timeout=timeout, candidate_uids=candidate_uids
         )
     return [metagraph.axons[uid] for uid in query_uids]
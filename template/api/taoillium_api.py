@@ -15,11 +15,33 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
+import aiohttp
+import asyncio
+import copy
+import glob
+import os
+import random
+import threading
+import time
 import bittensor as bt
+from contextlib import contextmanager
+import numpy as np
+import orjson
 from typing import List, Union, Any, Dict
 from bittensor import SubnetsAPI
+from bittensor.utils.networking import get_formatted_ws_endpoint_url
 import services.protocol as protocol
-from template.api.get_query_axons import get_query_api_axons
+from template.utils.logging import is_debug_enabled
+from services.api import ORJSON_OPTIONS
+from template.api.get_query_axons import get_query_api_nodes, get_stake_candidate_uids
+
+def _orjson_dumps_str(obj) -> str:
+    """aiohttp json_serialize hook: orjson encoding, returned as str as aiohttp expects"""
+    return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+
+
+# Empty synapse used for pings; dendrite copies the synapse per request, so one instance is shared
+_PING_SYNAPSE = bt.Synapse()
 
 
 class TaoilliumAPI(SubnetsAPI):
@@ -27,8 +49,29 @@ class TaoilliumAPI(SubnetsAPI):
     Standardized API client for Taoillium subnet.
     This class provides a clean interface for external clients to interact with the subnet.
     """
+
+    # Number of metagraph versions (blocks) whose miner candidate lists are kept
+    _UID_CACHE_SIZE = 4
+    # Maximum number of concurrent dendrite calls a query_network fan-out is split into
+    _QUERY_CHUNKS = 4
+    # Candidate pools at least this large are sampled with numpy instead of random.sample
+    _NUMPY_SAMPLE_MIN = 32
+    _rng = np.random.default_rng()
+    # Connection pool of the dendrite's aiohttp session, shared by every query and ping
+    _DENDRITE_POOL_LIMIT = 256
+    _DENDRITE_KEEPALIVE = 60
+    # Minimum seconds between warm_pool() runs started by health_check
+    _WARM_INTERVAL = 30.0
+    # Request types whose query_network responses may be reused for a few seconds, and the cache bounds
+    _CACHEABLE_TYPES = frozenset(("health",))
+    _QUERY_CACHE_TTL = 5.0
+    _QUERY_CACHE_SIZE = 128
+    # Where metagraph.save() writes snapshots. Not bittensor's default ~/.bittensor/metagraphs, which neurons
+    # on the same host also save to: old snapshots here are pruned, and those must never be theirs
+    _METAGRAPH_CACHE_ROOT = ("~", ".bittensor", "taoillium_api_metagraphs")
     
-    def __init__(self, wallet: "bt.wallet", netuid: int = None, network: str = 'local', chain_endpoint: str = 'ws://127.0.0.1:9944'):
+    def __init__(self, wallet: "bt.wallet", netuid: int = None, network: str = 'local', chain_endpoint: str = 'ws://127.0.0.1:9944',
+                 metagraph_cache_ttl: float = 60):
         super().__init__(wallet)
         if netuid is None:
             raise ValueError("netuid is required")
@@ -40,71 +83,166 @@ class TaoilliumAPI(SubnetsAPI):
 
         self.netuid = netuid
         self.name = "taoillium"
-        
-        # Create config for metagraph with chain_endpoint
-        import argparse
-        parser = argparse.ArgumentParser()
-        bt.subtensor.add_args(parser)
-        config = bt.config(parser)
+        self._init_state()
 
+        # Create config for metagraph with chain_endpoint. Only these two fields are read by
+        # bt.subtensor, so build it directly instead of registering every subtensor CLI option
+        config = bt.config()
+        config.subtensor = bt.config()
         config.subtensor.network = network
         config.subtensor.chain_endpoint = chain_endpoint
         
-        # Debug: Print the actual config values
-        bt.logging.info(f"Config before subtensor creation:")
-        bt.logging.info(f"  config.subtensor.network = {config.subtensor.network}")
-        bt.logging.info(f"  config.subtensor.chain_endpoint = {config.subtensor.chain_endpoint}")
-        
-        # Force set environment variable to ensure Bittensor uses our chain_endpoint
-        import os
-        os.environ['BT_SUBTENSOR_CHAIN_ENDPOINT'] = chain_endpoint
-        bt.logging.info(f"Set BT_SUBTENSOR_CHAIN_ENDPOINT={chain_endpoint}")
-        
-        # Debug: Check if environment variable is set correctly
-        bt.logging.info(f"Environment BT_SUBTENSOR_CHAIN_ENDPOINT: {os.environ.get('BT_SUBTENSOR_CHAIN_ENDPOINT', 'NOT_SET')}")
-        
-        # Create subtensor and metagraph with config
-        bt.logging.info(f"Creating subtensor with config: network={config.subtensor.network}, chain_endpoint={config.subtensor.chain_endpoint}")
-        
-        # Debug: Print all config values before creating subtensor
-        bt.logging.info(f"Full config.subtensor values:")
-        for attr in dir(config.subtensor):
-            if not attr.startswith('_'):
-                try:
-                    value = getattr(config.subtensor, attr)
-                    bt.logging.info(f"  {attr}: {value}")
-                except:
-                    pass
-        
+        # Create subtensor with config; a wrong endpoint is a config bug, so fail here
+        # instead of patching the connected subtensor afterwards
         self.subtensor = bt.subtensor(config=config)
-        
-        # Debug: Check what chain_endpoint the subtensor actually uses
         bt.logging.info(f"Subtensor created with chain_endpoint: {self.subtensor.chain_endpoint}")
-        
-        # Force override the chain_endpoint if it's wrong
-        if self.subtensor.chain_endpoint != chain_endpoint:
-            bt.logging.warning(f"Subtensor chain_endpoint mismatch! Expected: {chain_endpoint}, Got: {self.subtensor.chain_endpoint}")
-            # Try to force set the chain_endpoint
-            try:
-                self.subtensor.chain_endpoint = chain_endpoint
-                bt.logging.info(f"Force set subtensor chain_endpoint to: {self.subtensor.chain_endpoint}")
-            except Exception as e:
-                bt.logging.error(f"Failed to force set chain_endpoint: {e}")
-        self.metagraph = self.subtensor.metagraph(netuid=self.netuid)
-        
-        # Log metagraph info
-        bt.logging.info(f"Metagraph created: netuid={self.metagraph.netuid}, total_neurons={len(self.metagraph.axons)}")
-        bt.logging.info(f"Metagraph network: {self.metagraph.network}")
-        bt.logging.info(f"Metagraph block: {self.metagraph.block}")
-        
-        # Log some axon details for debugging
-        serving_axons = [i for i, axon in enumerate(self.metagraph.axons) if axon.is_serving]
-        bt.logging.info(f"Serving axons: {serving_axons}")
-        if serving_axons:
-            for uid in serving_axons[:3]:  # Show first 3 serving axons
-                axon = self.metagraph.axons[uid]
-                bt.logging.info(f"UID {uid}: {axon.ip}:{axon.port} (serving: {axon.is_serving})")
-        
+        if chain_endpoint and self.subtensor.chain_endpoint != get_formatted_ws_endpoint_url(chain_endpoint):
+            raise ValueError(
+                f"Subtensor chain_endpoint mismatch! Expected: {chain_endpoint}, Got: {self.subtensor.chain_endpoint}"
+            )
+
+        # The metagraph is a chain RPC; it is loaded on first use (off the event loop for async callers)
+        # from a saved snapshot younger than metagraph_cache_ttl seconds if there is one (0 disables it)
+        self.metagraph_cache_ttl = metagraph_cache_ttl
+        self._metagraph = None
+        self._metagraph_lock = threading.Lock()
+
+    def _init_state(self):
+        """Set up the selection caches and query state; no chain access."""
+        # metagraph block -> (non_validator_serving, serving_validator, all_non_validator) UIDs
+        self._uid_cache: Dict[int, tuple] = {}
+        # (metagraph block, serving UIDs)
+        self._serving_uids = None
+        # Axon IPs for vectorized 0.0.0.0 / external IP conflict checks, rebuilt when the axon list is replaced
+        self._axon_ips = None
+        self._axon_ips_src = None
+        # (axon IP array, dendrite external_ip, conflict mask) for the external_ip override check
+        self._ip_conflicts = None
+        # is_serving of every axon, rebuilt when the axon list is replaced
+        self._serving_mask = None
+        self._serving_mask_src = None
+        # Number of in-flight queries that need dendrite.external_ip overridden, and the value to restore
+        self._external_ip_overrides = 0
+        self._original_external_ip = None
+        self._external_ip_lock = threading.Lock()
+        # (metagraph block, n, candidate UIDs) for the stake-ranked API node selection
+        self._stake_candidates = None
+        # Background warm_pool() task started by health_check, and its monotonic start time
+        self._warm_task = None
+        self._last_warm = None
+        # Request key -> (monotonic time, uids, responses) for idempotent query_network calls
+        self._query_cache: Dict[tuple, tuple] = {}
+        # Validated once; prepare_synapse copies it instead of constructing a new model per query
+        self._synapse_template = protocol.ServiceProtocol()
+        # (target UIDs, synapse) of the last health probe
+        self._health_synapse = None
+
+    @property
+    def metagraph(self) -> "bt.metagraph":
+        """The subnet metagraph, loaded synchronously on first access if _ensure_metagraph() has not run yet."""
+        if self._metagraph is None:
+            self._load_metagraph()
+        return self._metagraph
+
+    @metagraph.setter
+    def metagraph(self, metagraph: "bt.metagraph"):
+        self._metagraph = metagraph
+
+    async def _ensure_metagraph(self) -> "bt.metagraph":
+        """Load the metagraph in a worker thread so the event loop is not blocked by the chain RPC."""
+        if self._metagraph is None:
+            await asyncio.to_thread(self._load_metagraph)
+        return self._metagraph
+
+    def _load_metagraph(self):
+        with self._metagraph_lock:
+            if self._metagraph is not None:
+                return
+            metagraph = self._load_cached_metagraph()
+            if metagraph is None:
+                metagraph = self.subtensor.metagraph(netuid=self.netuid)
+                self._save_cached_metagraph(metagraph)
+            
+            # Log metagraph info
+            bt.logging.info(f"Metagraph created: netuid={metagraph.netuid}, total_neurons={len(metagraph.axons)}")
+            bt.logging.info(f"Metagraph network: {metagraph.network}")
+            bt.logging.info(f"Metagraph block: {metagraph.block}")
+            
+            self._metagraph = metagraph
+            serving_axons = self._refresh_miner_pools()
+            
+            # Log some axon details for debugging
+            bt.logging.info(f"Serving axons: {serving_axons}")
+            if serving_axons:
+                for uid in serving_axons[:3]:  # Show first 3 serving axons
+                    axon = metagraph.axons[uid]
+                    bt.logging.info(f"UID {uid}: {axon.ip}:{axon.port} (serving: {axon.is_serving})")
+
+    def _refresh_miner_pools(self) -> List[int]:
+        """
+        Precompute the serving UIDs and miner candidate pools for a freshly loaded metagraph,
+        so the first query does not pay for the scans over all axons. Returns the serving UIDs.
+        """
+        self._serving_uids = None
+        self._get_miner_candidates()
+        return self._get_serving_uids()
+
+    def _get_serving_uids(self) -> List[int]:
+        """UIDs whose axons are serving, cached per metagraph block."""
+        block = int(self.metagraph.block)
+        cached = self._serving_uids
+        if cached is None or cached[0] != block:
+            cached = (block, np.flatnonzero(self._get_serving_mask()).tolist())
+            self._serving_uids = cached
+        return cached[1]
+        
+    def _metagraph_cache_dir(self) -> str:
+        return os.path.expanduser(os.path.join(
+            *self._METAGRAPH_CACHE_ROOT, f"network-{self.subtensor.network}", f"netuid-{self.netuid}"
+        ))
+
+    def _load_cached_metagraph(self):
+        """Return the last saved metagraph if it is younger than metagraph_cache_ttl, else None."""
+        if not self.metagraph_cache_ttl:
+            return None
+        try:
+            snapshots = glob.glob(os.path.join(self._metagraph_cache_dir(), "block-*.pt"))
+            if not snapshots:
+                return None
+            age = time.time() - max(os.path.getmtime(path) for path in snapshots)
+            if age > self.metagraph_cache_ttl:
+                return None
+            metagraph = bt.metagraph(netuid=self.netuid, network=self.subtensor.network, lite=True, sync=False)
+            metagraph.load_from_path(self._metagraph_cache_dir())
+            bt.logging.info(f"Metagraph loaded from cache ({age:.0f}s old)")
+            return metagraph
+        except Exception as e:
+            bt.logging.warning(f"Failed to load cached metagraph, syncing from chain: {e}")
+            return None
+
+    def _save_cached_metagraph(self, metagraph):
+        if not self.metagraph_cache_ttl:
+            return
+        try:
+            metagraph.save(root_dir=list(self._METAGRAPH_CACHE_ROOT))
+        except Exception as e:
+            bt.logging.warning(f"Failed to cache metagraph: {e}")
+            return
+        self._prune_cached_metagraphs()
+
+    def _prune_cached_metagraphs(self):
+        """Delete every saved snapshot but the newest; only the latest one is ever loaded."""
+        snapshots = glob.glob(os.path.join(self._metagraph_cache_dir(), "block-*.pt"))
+        if len(snapshots) < 2:
+            return
+        newest = max(snapshots, key=os.path.getmtime)
+        for path in snapshots:
+            if path != newest:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    bt.logging.debug(f"Failed to delete old metagraph snapshot {path}: {e}")
+
     def prepare_synapse(self, user_input: Dict[str, Any]) -> protocol.ServiceProtocol:
         """
         Prepare the synapse with user input for transit.
@@ -115,8 +253,19 @@ class TaoilliumAPI(SubnetsAPI):
         Returns:
             ServiceProtocol: Prepared synapse for network transmission
         """
-        # Create and fill the synapse with user input
-        synapse = protocol.ServiceProtocol(input=user_input)
+        # Health probes carry nothing but the target UIDs, so the last one is reused as is;
+        # dendrite sends a copy of the synapse to each axon, never the object itself
+        if user_input.get("__type__") == "health" and user_input.keys() <= {"__type__", "uids"}:
+            key = tuple(user_input.get("uids") or ())
+            cached = self._health_synapse
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            synapse = self._synapse_template.model_copy(update={"input": dict(user_input), "output": {}})
+            self._health_synapse = (key, synapse)
+            return synapse
+        # Copy the template and fill it with user input; output gets a fresh dict so it is
+        # never shared with the template
+        synapse = self._synapse_template.model_copy(update={"input": user_input, "output": {}})
         return synapse
         
     def process_responses(self, responses: List[Union["bt.Synapse", Any]]) -> List[Dict[str, Any]]:
@@ -147,81 +296,150 @@ class TaoilliumAPI(SubnetsAPI):
         Returns:
             List[Dict]: Processed responses from network nodes
         """
+        # Idempotent probes (health without explicit UIDs) reuse a recent answer for the same request
+        cache_key = None
+        if not user_input.get("uids") and user_input.get("__type__") in self._CACHEABLE_TYPES:
+            cache_key = (
+                orjson.dumps(user_input, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS),
+                sample_size, timeout, use_random_selection,
+            )
+            cached = self._query_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < self._QUERY_CACHE_TTL:
+                bt.logging.debug(f"query_network cache hit for {user_input.get('__type__')}")
+                user_input["uids"] = list(cached[1])
+                return copy.deepcopy(cached[2])
+            bt.logging.debug(f"query_network cache miss for {user_input.get('__type__')}")
+
+        uids = await self._select_query_uids(user_input, sample_size, timeout, use_random_selection)
+        user_input["uids"] = uids
+        if is_debug_enabled():
+            bt.logging.debug(f"query_network user_input: {user_input}")
+        # Prepare the synapse
+        synapse = self.prepare_synapse(user_input)
+        
+        # Get axons from metagraph, with the dendrite able to reach axons on this host
+        with self._axons_for(uids) as axons:
+            # Query the network with fixed axons, split into concurrent chunks so fast
+            # nodes are not serialized behind slow ones; responses keep the axon order
+            chunk = -(-len(axons) // self._QUERY_CHUNKS)
+            parts = await asyncio.gather(*(
+                self.dendrite(
+                    axons=axons[i:i + chunk],
+                    synapse=synapse,
+                    deserialize=True,
+                    timeout=timeout
+                )
+                for i in range(0, len(axons), chunk)
+            ))
+            responses = [response for part in parts for response in part]
+        bt.logging.info(f"axons: {axons}")
+        bt.logging.info(f"Received responses: {responses}")
+        if cache_key is not None:
+            if len(self._query_cache) >= self._QUERY_CACHE_SIZE:
+                self._query_cache.pop(next(iter(self._query_cache)))
+            # Callers own the responses they get back, so the cache keeps its own copy and hands out copies
+            self._query_cache[cache_key] = (time.monotonic(), uids, copy.deepcopy(responses))
+        # Process and return the responses
+        return responses
+        
+    async def _select_query_uids(self, user_input: Dict[str, Any], sample_size: int,
+                                 timeout: int, use_random_selection: bool) -> List[int]:
+        """Pick the UIDs a query goes to: the explicit user_input["uids"], pinged random miners, or top-stake API nodes."""
+        await self._ensure_metagraph()
+        self._ensure_dendrite_session()
         if user_input.get("uids"):
-            # Convert UIDs to integers, filtering out any non-numeric values
-            uids = []
-            for uid in user_input["uids"]:
-                try:
-                    uids.append(int(uid))
-                except (ValueError, TypeError):
-                    raise Exception(f"Skipping invalid UID: {uid} (must be an integer)")
+            # Convert UIDs to integers in one pass; find the offending value only on failure
+            try:
+                uids = list(map(int, user_input["uids"]))
+            except (ValueError, TypeError):
+                for uid in user_input["uids"]:
+                    try:
+                        int(uid)
+                    except (ValueError, TypeError):
+                        raise Exception(f"Skipping invalid UID: {uid} (must be an integer)")
+                raise
             
             if not uids:
                 raise Exception("No valid UIDs provided")
-                
-            axons = [self.metagraph.axons[uid] for uid in uids]
         else:
             if use_random_selection:
                 # Use random selection like forward_with_input
-                axons = await self.get_miner_uids_with_ping(sample_size)
-                # Get UIDs by finding the index of each axon in the metagraph
-                uids = []
-                for axon in axons:
-                    for uid in range(len(self.metagraph.axons)):
-                        if self.metagraph.axons[uid] == axon:
-                            uids.append(uid)
-                            break
+                uids = await self._ping_miner_uids(sample_size)
             else:
-                # Get available axons to query (based on stake ranking)
-                axons = await get_query_api_axons(
-                    wallet=self.wallet,
-                    metagraph=self.metagraph,
+                # Get available UIDs to query (based on stake ranking). Candidates always need
+                # validator trust and a successful ping, whatever the sample size
+                uids = await get_query_api_nodes(
+                    self.dendrite,
+                    self.metagraph,
                     n=0.1,  # Top 10% of nodes by stake
-                    timeout=timeout
+                    timeout=timeout,
+                    candidate_uids=self._get_stake_candidates(0.1)
                 )
-                # Get UIDs by finding the index of each axon in the metagraph
-                uids = []
-                for axon in axons:
-                    for uid in range(len(self.metagraph.axons)):
-                        if self.metagraph.axons[uid] == axon:
-                            uids.append(uid)
-                            break
         
-        # Limit the number of axons to query
-        if len(axons) > sample_size:
-            axons = axons[:sample_size]
-            uids = uids[:sample_size]
-            
-        if not axons:
+        # Limit the number of axons to query; the axons themselves are looked up once, by _axons_for
+        uids = uids[:sample_size]
+        if not uids:
             raise Exception("No available nodes found")
+        return uids
 
+    async def query_network_stream(self, user_input: Dict[str, Any],
+                                   sample_size: int = 3,
+                                   timeout: int = 30,
+                                   use_random_selection: bool = False):
+        """
+        Like query_network, but yield (uid, response) pairs in the order the nodes answer,
+        so callers can act on the fastest response instead of waiting for the slowest one.
+        Queries still in flight are cancelled when the generator is closed.
+        """
+        uids = await self._select_query_uids(user_input, sample_size, timeout, use_random_selection)
         user_input["uids"] = uids
-        bt.logging.debug(f"query_network user_input: {user_input}")
-        # Prepare the synapse
         synapse = self.prepare_synapse(user_input)
         
-        # Temporarily fix axon IPs in the metagraph
-        original_ips = self._fix_metagraph_axons(uids)
-        
-        try:
-            # Get axons from metagraph (which now have fixed IPs)
-            axons = [self.metagraph.axons[uid] for uid in uids]
-            
-            # Query the network with fixed axons
-            responses = await self.dendrite(
-                axons=axons,
-                synapse=synapse,
-                deserialize=True,
-                timeout=timeout
+        with self._axons_for(uids) as axons:
+            async def query(uid, axon):
+                return uid, await self.dendrite(axons=axon, synapse=synapse, deserialize=True, timeout=timeout)
+
+            tasks = [asyncio.create_task(query(uid, axon)) for uid, axon in zip(uids, axons)]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                pending = [task for task in tasks if not task.done()]
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+
+    def _ensure_dendrite_session(self):
+        """
+        Give the dendrite a long-lived aiohttp session with a larger keep-alive pool before its first request,
+        so repeat queries to the same miners reuse connections instead of reconnecting.
+        Synapse bodies (dendrite posts json=synapse.model_dump()) are encoded with orjson.
+        Must be called from the event loop that runs the queries.
+        """
+        if getattr(self.dendrite, "_session", None) is None:
+            self.dendrite._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._DENDRITE_POOL_LIMIT,
+                    keepalive_timeout=self._DENDRITE_KEEPALIVE,
+                ),
+                json_serialize=_orjson_dumps_str,
             )
-        finally:
-            # Always restore original IPs
-            self._restore_metagraph_axons(original_ips)
-        bt.logging.info(f"axons: {axons}")
-        bt.logging.info(f"Received responses: {responses}")
-        # Process and return the responses
-        return responses
-        
+
+    async def close(self):
+        """Stop the background warm-up and close the dendrite's shared aiohttp session."""
+        if self._warm_task is not None and not self._warm_task.done():
+            self._warm_task.cancel()
+        self._warm_task = None
+        await self.dendrite.aclose_session()
+
+    async def warm_pool(self, timeout: int = 3):
+        """Ping the top-stake API node candidates so their connections are open before real queries arrive."""
+        await self._ensure_metagraph()
+        uids = self._get_stake_candidates(0.1)
+        if uids:
+            await self.ping_uids(uids, timeout=timeout)
+
     async def health_check(self) -> Dict[str, Any]:
         """
         Perform a health check on the network.
@@ -229,42 +447,131 @@ class TaoilliumAPI(SubnetsAPI):
         Returns:
             Dict: Health status information
         """
+        # Prime connections in the background, at most once per _WARM_INTERVAL since warm_pool() pings
+        # every top-stake candidate; the health query itself does not wait on it.
+        # Repeated probes within _QUERY_CACHE_TTL are answered from the query_network cache
+        now = time.monotonic()
+        if (self._warm_task is None or self._warm_task.done()) and (
+                self._last_warm is None or now - self._last_warm >= self._WARM_INTERVAL):
+            self._last_warm = now
+            self._warm_task = asyncio.ensure_future(self.warm_pool())
+            self._warm_task.add_done_callback(self._log_warm_pool_failure)
         return await self.query_network(
             user_input={"__type__": "health"},
             sample_size=1,
             timeout=10
-        ) 
+        )
+
+    @staticmethod
+    def _log_warm_pool_failure(task: asyncio.Future):
+        """Log a failed warm_pool() run; retrieving the exception keeps asyncio from reporting it as never retrieved."""
+        if not task.cancelled() and task.exception() is not None:
+            bt.logging.warning(f"Connection pool warm-up failed: {task.exception()}")
     
-    def get_miner_uids(self, sample_size: int = 3) -> List[Any]:
+    def _get_miner_candidates(self):
         """
-        Get random miner axons (non-validators) from the metagraph.
+        Return the miner candidate UID lists for the current metagraph, cached per metagraph block.
+        The metagraph only changes on sync, so repeat callers skip the linear scans over all axons.
+        
+        Returns:
+            tuple: (non_validator_serving_uids, serving_validator_uids, all_non_validator_uids)
+        """
+        block = int(self.metagraph.block)
+        candidates = self._uid_cache.get(block)
+        if candidates is None:
+            candidates = self._compute_miner_candidates()
+            if len(self._uid_cache) >= self._UID_CACHE_SIZE:
+                self._uid_cache.pop(next(iter(self._uid_cache)))
+            self._uid_cache[block] = candidates
+        return candidates
+
+    def _compute_miner_candidates(self):
+        """
+        Compute the non-validator serving, serving validator and non-validator UIDs in a single pass over the axons.
+        Selection only falls back to a lower-priority list when the ones before it are empty, so those
+        are only materialized in that case (and are empty otherwise).
+        """
+        serving = self._get_serving_mask()
+        validator = np.asarray(self.metagraph.validator_permit, dtype=bool)[:len(serving)]
+        non_validator = ~validator
+        non_validator_serving_uids = np.flatnonzero(non_validator & serving).tolist()
+        if non_validator_serving_uids:
+            return non_validator_serving_uids, [], []
+        serving_validator_uids = np.flatnonzero(validator & serving).tolist()
+        if serving_validator_uids:
+            return non_validator_serving_uids, serving_validator_uids, []
+        return non_validator_serving_uids, serving_validator_uids, np.flatnonzero(non_validator).tolist()
+
+    def _get_axon_ips(self) -> np.ndarray:
+        """Axon IPs of the current metagraph as an object array, rebuilt only when the axon list is replaced."""
+        all_axons = self.metagraph.axons
+        if self._axon_ips_src is not all_axons:
+            self._axon_ips = np.array([axon.ip for axon in all_axons], dtype=object)
+            self._axon_ips_src = all_axons
+        return self._axon_ips
+
+    def _get_serving_mask(self) -> np.ndarray:
+        """is_serving of every metagraph axon as one bool array, read once per axon list instead of per UID."""
+        all_axons = self.metagraph.axons
+        if self._serving_mask_src is not all_axons:
+            self._serving_mask = np.fromiter((axon.is_serving for axon in all_axons), dtype=bool, count=len(all_axons))
+            self._serving_mask_src = all_axons
+        return self._serving_mask
+
+    def _get_stake_candidates(self, n: float) -> List[int]:
+        """Top-n-by-stake UIDs with validator trust, recomputed only when the metagraph block changes."""
+        block = int(self.metagraph.block)
+        cached = self._stake_candidates
+        if cached is None or cached[0] != block or cached[1] != n:
+            cached = (block, n, get_stake_candidate_uids(self.metagraph, n=n))
+            self._stake_candidates = cached
+        return cached[2]
+
+    def _sample_uids(self, uids: List[int], sample_size: int, stake_weighted: bool = False) -> List[int]:
+        """
+        Randomly pick up to sample_size distinct UIDs; large pools are sampled in C with numpy.
+        With stake_weighted, UIDs are drawn with probability proportional to stake (uniform if no stake).
+        """
+        k = min(sample_size, len(uids))
+        if stake_weighted:
+            uids_arr = np.asarray(uids, dtype=np.int64)
+            stakes = np.clip(np.asarray(self.metagraph.S, dtype=np.float64)[uids_arr], 0, None)
+            total = stakes.sum()
+            if total > 0:
+                # A tiny floor keeps zero-stake UIDs drawable so k distinct picks always exist
+                stakes += total * 1e-9 + 1e-12
+                return self._rng.choice(uids_arr, size=k, replace=False, p=stakes / stakes.sum()).tolist()
+        if len(uids) < self._NUMPY_SAMPLE_MIN:
+            return random.sample(uids, k)
+        return self._rng.choice(np.asarray(uids, dtype=np.int64), size=k, replace=False).tolist()
+
+    def _select_miner_uids(self, sample_size: int, stake_weighted: bool = False) -> List[int]:
+        """
+        Randomly select miner (non-validator) UIDs from the metagraph.
         
         Args:
-            sample_size: Number of miner axons to return
+            sample_size: Number of miner UIDs to return
+            stake_weighted: Prefer higher-stake miners, which are more likely to be online
             
         Returns:
-            List[Any]: List of miner axons
+            List[int]: Selected miner UIDs
         """
-        import random
-        
-        # First, try to get all non-validator UIDs that are serving
-        non_validator_serving_uids = [
-            uid for uid in range(len(self.metagraph.axons))
-            if not self.metagraph.validator_permit[uid] and self.metagraph.axons[uid].is_serving
-        ]
-        bt.logging.debug(f"Non-validator serving UIDs: {non_validator_serving_uids}")
-        
+        # Candidate UID lists, computed once per metagraph block
+        non_validator_serving_uids, serving_validator_uids, all_non_validator_uids = self._get_miner_candidates()
+        # UID lists can hold thousands of entries; only format them when debug logging is on
+        debug = is_debug_enabled()
+        if debug:
+            bt.logging.debug(f"Non-validator serving UIDs: {non_validator_serving_uids}")
+        
+        # First, try the non-validator UIDs that are serving
         # If we have non-validator serving nodes, use them
         if non_validator_serving_uids:
             miner_uids = non_validator_serving_uids
         else:
             # Special case: try to identify miners among serving validators
             # This handles cases where miners run on validator UIDs (like UID 2 in this case)
-            serving_validator_uids = [
-                uid for uid in range(len(self.metagraph.axons))
-                if self.metagraph.validator_permit[uid] and self.metagraph.axons[uid].is_serving
-            ]
-            bt.logging.debug(f"Serving validator UIDs: {serving_validator_uids}")
+            if debug:
+                bt.logging.debug(f"Serving validator UIDs: {serving_validator_uids}")
             
             # For now, we'll include all serving validators as potential miners
             # In a production system, you might want to add more sophisticated detection
@@ -273,169 +580,183 @@ class TaoilliumAPI(SubnetsAPI):
             
             # If still no miners, fall back to all non-validator nodes
             if not miner_uids:
-                all_non_validator_uids = [
-                    uid for uid in range(len(self.metagraph.axons))
-                    if not self.metagraph.validator_permit[uid]
-                ]
-                bt.logging.debug(f"No serving nodes found, using all non-validator UIDs: {all_non_validator_uids}")
+                if debug:
+                    bt.logging.debug(f"No serving nodes found, using all non-validator UIDs: {all_non_validator_uids}")
                 miner_uids = all_non_validator_uids
         
         if not miner_uids:
             raise Exception("No available miners found")
         
         # Randomly sample the requested number of miners
-        selected_uids = random.sample(miner_uids, min(sample_size, len(miner_uids)))
-        bt.logging.debug(f"Selected miner UIDs: {selected_uids}")
-        
-        # Return axons instead of UIDs
-        selected_axons = [self.metagraph.axons[uid] for uid in selected_uids]
-        return selected_axons
-
+        selected_uids = self._sample_uids(miner_uids, sample_size, stake_weighted=stake_weighted)
+        if debug:
+            bt.logging.debug(f"Selected miner UIDs: {selected_uids}")
+        return selected_uids
 
+    def get_miner_uids(self, sample_size: int = 3) -> List[Any]:
+        """
+        Get random miner axons (non-validators) from the metagraph.
+        
+        Args:
+            sample_size: Number of miner axons to return
+            
+        Returns:
+            List[Any]: List of miner axons
+        """
+        all_axons = self.metagraph.axons
+        return [all_axons[uid] for uid in self._select_miner_uids(sample_size)]
 
     async def get_miner_uids_with_ping(self, sample_size: int = 3, timeout: int = 3) -> List[Any]:
         """Get miner axons with actual network connectivity test"""
-        # Get candidate UIDs directly
-        candidate_uids = self._get_miner_uids_list(sample_size * 2)  # get more candidates
-        
-        # ping test
-        bt.logging.debug(f"Candidate UIDs: {candidate_uids}")
-        successful_uids = await self.ping_uids(candidate_uids, timeout=timeout)
-        bt.logging.debug(f"Successful UIDs: {successful_uids}")
+        uids = await self._ping_miner_uids(sample_size, timeout=timeout)
         # Return successful axons
-        return [self.metagraph.axons[uid] for uid in successful_uids[:sample_size]]
+        all_axons = self.metagraph.axons
+        return [all_axons[uid] for uid in uids]
+
+    async def _ping_miner_uids(self, sample_size: int = 3, timeout: int = 3) -> List[int]:
+        """Get miner UIDs that answered a ping, so callers need no axon -> UID reverse lookup"""
+        await self._ensure_metagraph()
+        # Get candidate UIDs directly, in stake-weighted random order so that the first ones are
+        # less likely to be offline; at most 2 * sample_size of them are ever pinged
+        candidate_uids = self._select_miner_uids(2 * sample_size, stake_weighted=True)
+        
+        # ping test: the first batch carries a few spares, later batches only the shortfall, and
+        # ping_uids stops each batch as soon as enough have answered
+        debug = is_debug_enabled()
+        if debug:
+            bt.logging.debug(f"Candidate UIDs: {candidate_uids}")
+        successful_uids = []
+        start, batch = 0, sample_size + max(1, sample_size // 2)
+        while start < len(candidate_uids) and len(successful_uids) < sample_size:
+            needed = sample_size - len(successful_uids)
+            successful_uids += await self.ping_uids(
+                candidate_uids[start:start + batch], timeout=timeout, needed=needed
+            )
+            start += batch
+            batch = sample_size - len(successful_uids)
+        if debug:
+            bt.logging.debug(f"Successful UIDs: {successful_uids}")
+        return successful_uids[:sample_size]
 
     def _get_miner_uids_list(self, sample_size: int = 3) -> List[int]:
         """Get random miner UIDs (not axons) from the metagraph."""
-        import random
-        
-        # First, try to get all non-validator UIDs that are serving
-        non_validator_serving_uids = [
-            uid for uid in range(len(self.metagraph.axons))
-            if not self.metagraph.validator_permit[uid] and self.metagraph.axons[uid].is_serving
-        ]
-        bt.logging.debug(f"Non-validator serving UIDs: {non_validator_serving_uids}")
-        
-        # If we have non-validator serving nodes, use them
-        if non_validator_serving_uids:
-            miner_uids = non_validator_serving_uids
-        else:
-            # Special case: try to identify miners among serving validators
-            serving_validator_uids = [
-                uid for uid in range(len(self.metagraph.axons))
-                if self.metagraph.validator_permit[uid] and self.metagraph.axons[uid].is_serving
-            ]
-            bt.logging.debug(f"Serving validator UIDs: {serving_validator_uids}")
-            
-            # For now, we'll include all serving validators as potential miners
-            miner_uids = serving_validator_uids
-            
-            # If still no miners, fall back to all non-validator nodes
-            if not miner_uids:
-                all_non_validator_uids = [
-                    uid for uid in range(len(self.metagraph.axons))
-                    if not self.metagraph.validator_permit[uid]
-                ]
-                bt.logging.debug(f"No serving nodes found, using all non-validator UIDs: {all_non_validator_uids}")
-                miner_uids = all_non_validator_uids
-        
-        if not miner_uids:
-            raise Exception("No available miners found")
-        
-        # Randomly sample the requested number of miners
-        selected_uids = random.sample(miner_uids, min(sample_size, len(miner_uids)))
-        bt.logging.debug(f"Selected miner UIDs: {selected_uids}")
-        
-        # Return UIDs directly
-        return selected_uids
+        return self._select_miner_uids(sample_size)
 
-    async def ping_uids(self, uids, timeout=10):
-        # Temporarily fix axon IPs in the metagraph
-        original_ips = self._fix_metagraph_axons(uids)
+    async def ping_uids(self, uids, timeout=10, needed=None):
+        """
+        Ping the given UIDs and return those that answered with status 200, fastest first.
         
-        try:
-            axons = [self.metagraph.axons[uid] for uid in uids]
-            
-            # Debug: Print axon details before pinging
-            bt.logging.debug(f"Pinging axons:")
-            for uid, axon in zip(uids, axons):
-                bt.logging.debug(f"  UID {uid}: {axon.ip}:{axon.port} (serving: {axon.is_serving})")
-            
-            # Debug: Check what we're passing to dendrite
-            bt.logging.debug(f"Passing {len(axons)} axons to dendrite:")
-            for i, axon in enumerate(axons):
-                bt.logging.debug(f"  Dendrite axon {i}: {axon.ip}:{axon.port}")
+        Args:
+            uids: UIDs to ping
+            timeout: Ping timeout in seconds
+            needed: If set, stop as soon as this many UIDs have answered and cancel the remaining pings
+        """
+        await self._ensure_metagraph()
+        self._ensure_dendrite_session()
+        with self._axons_for(uids) as axons:
+            debug = is_debug_enabled()
+            if debug:
+                bt.logging.debug(f"Pinging {len(axons)} axons: " + ", ".join(
+                    f"UID {uid} {axon.ip}:{axon.port} (serving: {axon.is_serving})" for uid, axon in zip(uids, axons)
+                ))
             
-            responses = await self.dendrite(axons, bt.Synapse(), deserialize=False, timeout=timeout)
-        finally:
-            # Always restore original IPs
-            self._restore_metagraph_axons(original_ips)
-        
-        # Debug: Print response details
-        for uid, response in zip(uids, responses):
-            if hasattr(response, 'dendrite') and hasattr(response.dendrite, 'status_code'):
-                bt.logging.debug(f"  UID {uid}: status_code={response.dendrite.status_code}")
-            else:
-                bt.logging.debug(f"  UID {uid}: no status_code attribute")
-        
-        # only return successful uids
-        successful_uids = [
-            uid for uid, response in zip(uids, responses)
-            if hasattr(response, 'dendrite') and hasattr(response.dendrite, 'status_code') and response.dendrite.status_code == 200
-        ]
-        
-        bt.logging.debug(f"Successful UIDs: {successful_uids}")
+            # One dendrite call per axon so a slow or dead peer cannot hold up the others
+            async def ping(uid, axon):
+                try:
+                    return uid, await self.dendrite(axon, _PING_SYNAPSE, deserialize=False, timeout=timeout)
+                except Exception as e:
+                    if debug:
+                        bt.logging.debug(f"  UID {uid}: ping failed: {e}")
+                    return uid, None
+
+            tasks = [asyncio.create_task(ping(uid, axon)) for uid, axon in zip(uids, axons)]
+            successful_uids = []
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    uid, response = await next_done
+                    if hasattr(response, 'dendrite') and hasattr(response.dendrite, 'status_code'):
+                        if debug:
+                            bt.logging.debug(f"  UID {uid}: status_code={response.dendrite.status_code}")
+                        # only return successful uids
+                        if response.dendrite.status_code == 200:
+                            successful_uids.append(uid)
+                            if needed is not None and len(successful_uids) >= needed:
+                                break
+                    elif debug:
+                        bt.logging.debug(f"  UID {uid}: no status_code attribute")
+            finally:
+                # Stop waiting on stragglers once enough UIDs have answered, and let the
+                # cancellations land before the dendrite external_ip is restored
+                pending = [task for task in tasks if not task.done()]
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+        
+        if debug:
+            bt.logging.debug(f"Successful UIDs: {successful_uids}")
         return successful_uids
 
-    def _fix_metagraph_axons(self, uids):
+    @contextmanager
+    def _axons_for(self, uids):
         """
-        Temporarily fix axon IPs in the metagraph for the given UIDs
+        Yield the metagraph axons for the given UIDs, with the dendrite able to reach axons on this host.
         The root cause of this is that the axon IPs are 0.0.0.0 when the manager is running on the same server as the axon.
         code is from /bittensor/core/dendrite.py:_get_endpoint_url https://github.com/opentensor/bittensor/blob/master/bittensor/core/dendrite.py#L239
+        The shared metagraph axons are never modified. Only dendrite.external_ip is overridden while such axons
+        are queried, and the override is reference-counted so concurrent queries cannot undo each other's.
         """
-        bt.logging.debug(f"_fix_metagraph_axons called with UIDs: {uids}")
-        
-        # Store original IPs to restore later
-        original_ips = {}
-        
-        # Get dendrite's external IP to check for conflicts
-        dendrite_external_ip = getattr(self.dendrite, 'external_ip', None)
-        bt.logging.debug(f"Dendrite external_ip: {dendrite_external_ip}")
-        
-        # Store original dendrite external_ip to restore later
-        original_dendrite_external_ip = dendrite_external_ip
-        
-        for uid in uids:
-            axon = self.metagraph.axons[uid]
-            bt.logging.debug(f"UID {uid} axon IP: {axon.ip}")
-            
-            # Fix IP if it's 0.0.0.0 or if it conflicts with dendrite's external_ip
-            if axon.ip == "0.0.0.0" or (dendrite_external_ip and axon.ip == str(dendrite_external_ip)):
-                # Temporarily change dendrite's external_ip to avoid conflict
-                if hasattr(self.dendrite, 'external_ip'):
-                    self.dendrite.external_ip = "127.0.0.1"  # Use localhost to avoid conflict
-                    bt.logging.debug(f"Temporarily changed dendrite external_ip from {original_dendrite_external_ip} to {self.dendrite.external_ip}")
-                original_ips[uid] = axon.ip
-                bt.logging.debug(f"Detected IP conflict for UID {uid}: axon.ip={axon.ip}, original dendrite.external_ip={original_dendrite_external_ip}")
-            else:
-                bt.logging.debug(f"Metagraph axon UID {uid} IP {axon.ip} is not 0.0.0.0 and doesn't conflict with dendrite external_ip, no fix needed")
-        
-        # Store the original dendrite external_ip in the return dict with a special key
-        original_ips['_dendrite_external_ip'] = original_dendrite_external_ip
-        
-        return original_ips
-
-    def _restore_metagraph_axons(self, original_ips):
-        """Restore original axon IPs in the metagraph and dendrite external_ip"""
-        # Restore dendrite external_ip if it was modified
-        if '_dendrite_external_ip' in original_ips:
-            original_dendrite_external_ip = original_ips['_dendrite_external_ip']
-            if hasattr(self.dendrite, 'external_ip'):
-                self.dendrite.external_ip = original_dendrite_external_ip
-                bt.logging.debug(f"Restored dendrite external_ip to {original_dendrite_external_ip}")
-        
-        # Restore axon IPs
-        for uid, original_ip in original_ips.items():
-            if uid != '_dendrite_external_ip':  # Skip the special key
-                self.metagraph.axons[uid].ip = original_ip
-                bt.logging.debug(f"Restored metagraph axon UID {uid} IP to {original_ip}")
\ No newline at end of file
+        all_axons = self.metagraph.axons
+        axons = [all_axons[uid] for uid in uids]
+        override = self._needs_external_ip_override(uids)
+        if override:
+            self._acquire_external_ip_override()
+        try:
+            yield axons
+        finally:
+            if override:
+                self._release_external_ip_override()
+
+    def _needs_external_ip_override(self, uids) -> bool:
+        """True if any axon is 0.0.0.0 or has the dendrite's external_ip, which dendrite would rewrite to 0.0.0.0."""
+        if not hasattr(self.dendrite, 'external_ip'):
+            return False
+        # While an override is active, compare against the real external IP
+        dendrite_external_ip = self._original_external_ip if self._external_ip_overrides else self.dendrite.external_ip
+        conflicts = self._get_ip_conflicts(dendrite_external_ip)
+        # Public IPs everywhere (the usual case): nothing to check per UID
+        if not conflicts.any():
+            return False
+        uids = np.asarray(uids, dtype=np.int64)
+        conflict = conflicts[uids]
+        if conflict.any():
+            if is_debug_enabled():
+                bt.logging.debug(f"IP conflicts for UIDs {uids[conflict].tolist()} (dendrite external_ip is {dendrite_external_ip})")
+            return True
+        return False
+
+    def _get_ip_conflicts(self, dendrite_external_ip) -> np.ndarray:
+        """Per-axon mask of IPs that need the external_ip override, cached per axon list and external IP."""
+        ips = self._get_axon_ips()
+        cached = self._ip_conflicts
+        if cached is None or cached[0] is not ips or cached[1] != dendrite_external_ip:
+            conflicts = ips == "0.0.0.0"
+            if dendrite_external_ip:
+                conflicts |= ips == str(dendrite_external_ip)
+            cached = (ips, dendrite_external_ip, conflicts)
+            self._ip_conflicts = cached
+        return cached[2]
+
+    def _acquire_external_ip_override(self):
+        with self._external_ip_lock:
+            if not self._external_ip_overrides:
+                self._original_external_ip = self.dendrite.external_ip
+                self.dendrite.external_ip = "127.0.0.1"  # Use localhost to avoid conflict
+            self._external_ip_overrides += 1
+
+    def _release_external_ip_override(self):
+        with self._external_ip_lock:
+            self._external_ip_overrides -= 1
+            if not self._external_ip_overrides:
+                self.dendrite.external_ip = self._original_external_ip
+                self._original_external_ip = None
@@ -99,6 +99,9 @@ class BaseMinerNeuron(BaseNeuron):
             Exception: For unforeseen errors during the miner's operation, which are logged for diagnosis.
         """
 
+        # The login started in __init__ sets the API key forward uses; wait for it before the axon serves
+        self.wait_for_business_server_login()
+
         # Check that miner is registered on the network.
         self.sync()
 
@@ -122,10 +125,12 @@ class BaseMinerNeuron(BaseNeuron):
                 # For miners, since last_update doesn't change, we use a different epoch calculation
                 # We can use the current block number to determine when to sync
                 current_block = self.block
-                epoch_start_block = (current_block // self.config.neuron.epoch_length) * self.config.neuron.epoch_length
-                bt.logging.trace(f"Current block: {current_block}, epoch_start_block: {epoch_start_block}, epoch_length: {self.config.neuron.epoch_length}")
+                epoch_length = self.get_epoch_length()
+                epoch_start_block = (current_block // epoch_length) * epoch_length
+                bt.logging.trace(f"Current block: {current_block}, epoch_start_block: {epoch_start_block}, epoch_length: {epoch_length}")
                 # Wait until we reach the next epoch block
-                while current_block < epoch_start_block + self.config.neuron.epoch_length:
+                next_epoch_block = epoch_start_block + epoch_length
+                while current_block < next_epoch_block:
                     # Wait before checking again.
                     time.sleep(settings.MINER_SLEEP_TIME)
                     current_block = self.block
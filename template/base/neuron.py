@@ -15,19 +15,24 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
+import asyncio
 import copy
+import json
 import typing
 import time
 import bittensor as bt
+import numpy as np
 import os
 import signal
 import sys
+import threading
 
 from abc import ABC, abstractmethod
 
 # Sync calls set weights and also resyncs the metagraph.
 from template.utils.config import check_config, add_args, config
 from template.utils.misc import ttl_get_block
+from template.utils.logging import is_debug_enabled
 from template import __spec_version__ as spec_version
 from template.mock import MockSubtensor, MockMetagraph
 from websockets.protocol import State as WebSocketClientState
@@ -63,12 +68,48 @@ class BaseNeuron(ABC):
     spec_version: int = spec_version
     axon_data: dict = {}
 
+    # Background business server refresh state, see start_business_server_refresh().
+    _refresh_thread: typing.Optional[threading.Thread] = None
+    _refresh_backoff: float = 1.0
+    _next_refresh_attempt: float = 0.0
+    # Last neuron access token as returned by create_neuron_access_token, reused until close to expiry.
+    _neuron_token_cache: typing.Optional[dict] = None
+    # Seconds before token expiry at which a refresh is due, the resulting absolute deadline, and the
+    # metagraph axon list axon_data was read from, see _business_server_refresh_due().
+    _refresh_interval_s: float = 300.0
+    _next_refresh_deadline: float = 0.0
+    _axon_data_src: typing.Optional[list] = None
+    # is_serving of every metagraph axon and the axon list it was read from, see get_serving_mask().
+    _serving_mask: typing.Optional[np.ndarray] = None
+    # Epoch length in blocks, set from the cached or chain tempo at init, see _init_epoch_length().
+    _epoch_length: int = 0
+    # Last known chain tempo per network and netuid, so a restart does not wait on the tempo RPC.
+    _TEMPO_CACHE_PATH = os.path.expanduser("~/.bittensor/tempo_cache.json")
+    # Set when the epoch length came from the cached tempo; the next sync() re-reads it from chain.
+    _epoch_length_refresh_due: bool = False
+    _serving_axons: typing.Optional[list] = None
+    # Backoff between failed subtensor re-creations, see set_subtensor().
+    _subtensor_backoff: float = 1.0
+    _next_subtensor_attempt: float = 0.0
+    # Shared random generator, e.g. for get_random_uids(); created once instead of per call.
+    rng: np.random.Generator = np.random.default_rng()
+    # Set by the first shutdown signal, see _signal_handler().
+    _shutdown_started: bool = False
+    # Background business server login started by __init__, see start_business_server_login().
+    _login_thread: typing.Optional[threading.Thread] = None
+    # Long-lived business server client, see get_service_client().
+    _service_client: typing.Optional[ServiceApiClient] = None
+    # hotkey -> UID and the metagraph.hotkeys list it was built from, see get_uid_for_hotkey().
+    _hotkey_to_uid: typing.Optional[dict] = None
+    _hotkey_index_src: typing.Optional[list] = None
+
     @property
     def block(self):
         return ttl_get_block(self)
 
     def __init__(self, config=None):
-        base_config = copy.deepcopy(config or BaseNeuron.config())
+        # merge() copies leaf values into the fresh self.config, so the base config needs no deep copy
+        base_config = config if config is not None else BaseNeuron.config()
         self.config = self.config()
         self.config.merge(base_config)
         self.check_config(self.config)
@@ -79,8 +120,9 @@ class BaseNeuron(ABC):
         # If a gpu is required, set the device to cuda:N (e.g. cuda:0)
         self.device = self.config.neuron.device
 
-        # Log the configuration for reference.
-        bt.logging.info(self.config)
+        # Log the configuration for reference; str(config) renders the whole tree, so only when it is emitted.
+        if is_debug_enabled():
+            bt.logging.debug(self.config)
 
         # Build Bittensor objects
         # These are core Bittensor classes to interact with the network.
@@ -100,13 +142,17 @@ class BaseNeuron(ABC):
             self.subtensor = bt.subtensor(config=self.config)
             self.metagraph = self.subtensor.metagraph(self.config.netuid)
 
-        bt.logging.info(f"Wallet: {self.wallet}")
-        # bt.logging.info(f"Coldkey Address: {self.wallet.coldkey.ss58_address}")
-        bt.logging.info(f"Hotkey Address: {self.wallet.hotkey.ss58_address}")
-        bt.logging.info(f"Subtensor: {self.subtensor}")
-        bt.logging.info(f"Metagraph: {self.metagraph}")
+        # The hotkey never changes; reading it through the wallet can touch the keyfile, so read it once
+        self._hotkey_ss58 = self.wallet.hotkey.ss58_address
+
+        if is_debug_enabled():
+            bt.logging.debug(f"Wallet: {self.wallet}")
+            # bt.logging.debug(f"Coldkey Address: {self.wallet.coldkey.ss58_address}")
+            bt.logging.debug(f"Hotkey Address: {self._hotkey_ss58}")
+            bt.logging.debug(f"Subtensor: {self.subtensor}")
+            bt.logging.debug(f"Metagraph: {self.metagraph}")
 
-        my_srv_api_key = f"SRV_API_KEY_{self.wallet.hotkey.ss58_address}"
+        my_srv_api_key = f"SRV_API_KEY_{self._hotkey_ss58}"
         self.current_api_key_name = None
         self.current_api_key_value = None
         
@@ -114,11 +160,11 @@ class BaseNeuron(ABC):
             settings.SRV_API_KEY = os.getenv(my_srv_api_key)
             self.current_api_key_value = settings.SRV_API_KEY
             self.current_api_key_name = my_srv_api_key
-            bt.logging.info(f"Using SRV_API_KEY from environment variable: {my_srv_api_key}")
+            bt.logging.debug(f"Using SRV_API_KEY from environment variable: {my_srv_api_key}")
         else:
             self.current_api_key_value = settings.SRV_API_KEY
             self.current_api_key_name = "SRV_API_KEY"
-            bt.logging.info("Using SRV_API_KEY from environment variable: SRV_API_KEY")
+            bt.logging.debug("Using SRV_API_KEY from environment variable: SRV_API_KEY")
 
         # Set up signal handlers for graceful shutdown
         self._setup_signal_handlers()
@@ -127,9 +173,7 @@ class BaseNeuron(ABC):
         self.check_registered()
 
         # Each miner gets a unique identity (UID) in the network for differentiation.
-        self.uid = self.metagraph.hotkeys.index(
-            self.wallet.hotkey.ss58_address
-        )
+        self.uid = self.get_uid_for_hotkey(self._hotkey_ss58)
         bt.logging.info(
             f"Running neuron on subnet: {self.config.netuid} with type {self.neuron_type} uid {self.uid} using network: {self.subtensor.chain_endpoint}"
         )
@@ -137,11 +181,40 @@ class BaseNeuron(ABC):
 
         self.last_neuron_registration_expire = time.time() +  600  # 10 minutes from now
         self.last_service_token_expire = time.time() +  600  # 10 minutes from now
+        # Refresh tokens 5 minutes (at most) before expiration
+        self._refresh_interval_s = min(settings.NEURON_JWT_EXPIRE_IN * 60, 300)
+        self._update_refresh_deadline()
+
+        # Set epoch length from the cached chain tempo; the first sync() refreshes it from chain
+        self._init_epoch_length()
+
+        # Sign and log in off the init critical path; API calls wait for it in get_service_client()
+        self.start_business_server_login()
+
+    def start_business_server_login(self):
+        """Runs _login_to_business_server on a background thread."""
+        self._login_thread = threading.Thread(
+            target=self._login_to_business_server,
+            name="BusinessServerLogin",
+            daemon=True,
+        )
+        self._login_thread.start()
 
-        # Set epoch length from chain during initialization
-        self._set_epoch_length_from_chain()
-
-        self._login_to_business_server()
+    def wait_for_business_server_login(self, timeout: float = 30.0):
+        """
+        Blocks until the background login has finished, so API calls use the token it obtained.
+        Never blocks a running event loop: async code waits for the login before its loop starts, see run(),
+        or through asyncio.to_thread.
+        """
+        login_thread = self._login_thread
+        if login_thread is None or login_thread is threading.current_thread() or not login_thread.is_alive():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            login_thread.join(timeout)
+        else:
+            bt.logging.debug("Business server login still running, not blocking the event loop on it")
 
     def _login_to_business_server(self):
         login_time = int(time.time()*1000)
@@ -153,7 +226,7 @@ class BaseNeuron(ABC):
         sign_result = {
             "signature": signature_hex,
             "message": login_time,
-            "ss58Address": self.wallet.hotkey.ss58_address,
+            "ss58Address": self._hotkey_ss58,
             "timestamp": login_time,
         }
 
@@ -163,6 +236,7 @@ class BaseNeuron(ABC):
             if result.get("nodeToken"):
                 self.current_api_key_value = result.get("nodeToken").get("access_token")
                 self.last_service_token_expire = result.get("nodeToken").get("exp")
+                self._update_refresh_deadline()
                 bt.logging.info(f"Using NODE_TOKEN from business server, expires at: {self.last_service_token_expire}")
             else:
                 bt.logging.error(f"Failed to login to business server: {result}")
@@ -170,41 +244,131 @@ class BaseNeuron(ABC):
             bt.logging.error(f"Failed to login to business server: {e}")
 
 
+    def _init_epoch_length(self):
+        """
+        Sets the epoch length from the last cached chain tempo; the next sync() refreshes it from chain.
+        Without a cached tempo (first start on this network/netuid, or a mock chain) the chain is queried before returning.
+        """
+        self._config_epoch_length = int(self.config.neuron.epoch_length)
+        cached_tempo = self._load_cached_tempo() if self._tempo_cache_enabled() else None
+        if cached_tempo is None:
+            self._set_epoch_length_from_chain()
+            return
+        self._apply_chain_tempo(cached_tempo)
+        self._epoch_length_refresh_due = True
+
     def _set_epoch_length_from_chain(self):
         """
-        Sets the epoch length from the chain using subtensor.tempo() during initialization.
-        Updates self.config.neuron.epoch_length with the chain value.
+        Sets the epoch length from the chain using subtensor.tempo() and caches the tempo on disk (except for a mock chain).
+        Updates self.config.neuron.epoch_length with the chain value and caches the result in self._epoch_length.
         """
+        self._epoch_length_refresh_due = False
         try:
             chain_tempo = self.subtensor.tempo(netuid=self.config.netuid)
-            if chain_tempo is not None and chain_tempo <= self.config.neuron.epoch_length:
-                self.config.neuron.epoch_length = chain_tempo
-                bt.logging.info(f"Set epoch length from chain: {chain_tempo} blocks for netuid {self.config.netuid}")
-            elif chain_tempo is not None:
-                bt.logging.info(f"Chain tempo ({chain_tempo}) > config epoch_length ({self.config.neuron.epoch_length}), using config value for more frequent weight updates")
+            if chain_tempo is not None:
+                self._apply_chain_tempo(chain_tempo)
+                if self._tempo_cache_enabled():
+                    self._save_cached_tempo(chain_tempo)
             else:
-                bt.logging.warning(f"Could not retrieve tempo from chain for netuid {self.config.netuid}, using config default: {self.config.neuron.epoch_length}")
+                bt.logging.warning(f"Could not retrieve tempo from chain for netuid {self.config.netuid}, using epoch length: {self.config.neuron.epoch_length}")
         except Exception as e:
-            bt.logging.warning(f"Failed to query epoch length from chain: {e}, using config default: {self.config.neuron.epoch_length}")
+            bt.logging.warning(f"Failed to query epoch length from chain: {e}, using epoch length: {self.config.neuron.epoch_length}")
+        self._epoch_length = int(self.config.neuron.epoch_length)
+
+    def _apply_chain_tempo(self, chain_tempo: int):
+        """Uses the chain tempo as epoch length unless the configured epoch length is shorter."""
+        if chain_tempo <= self._config_epoch_length:
+            self.config.neuron.epoch_length = chain_tempo
+            bt.logging.info(f"Set epoch length from chain: {chain_tempo} blocks for netuid {self.config.netuid}")
+        else:
+            self.config.neuron.epoch_length = self._config_epoch_length
+            bt.logging.info(f"Chain tempo ({chain_tempo}) > config epoch_length ({self._config_epoch_length}), using config value for more frequent weight updates")
+        self._epoch_length = int(self.config.neuron.epoch_length)
+
+    def _tempo_cache_enabled(self) -> bool:
+        """The tempo file cache is for real chains only; mock neurons (and the tests using them) never touch it."""
+        return not (self.config.mock or getattr(self.config.subtensor, "_mock", False))
+
+    def _tempo_cache_key(self) -> str:
+        return f"{self.subtensor.network}:{self.config.netuid}"
+
+    def _load_cached_tempo(self) -> typing.Optional[int]:
+        try:
+            with open(self._TEMPO_CACHE_PATH) as f:
+                return int(json.load(f)[self._tempo_cache_key()])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_cached_tempo(self, chain_tempo: int):
+        try:
+            try:
+                with open(self._TEMPO_CACHE_PATH) as f:
+                    cache = json.load(f)
+                if not isinstance(cache, dict):
+                    cache = {}
+            except (OSError, ValueError):
+                cache = {}
+            if cache.get(self._tempo_cache_key()) == chain_tempo:
+                return
+            cache[self._tempo_cache_key()] = int(chain_tempo)
+            os.makedirs(os.path.dirname(self._TEMPO_CACHE_PATH), exist_ok=True)
+            # Write then rename, so a neuron starting concurrently never reads a partial file
+            tmp_path = f"{self._TEMPO_CACHE_PATH}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, self._TEMPO_CACHE_PATH)
+        except OSError as e:
+            bt.logging.warning(f"Failed to cache chain tempo: {e}")
+
+    def _subtensor_connected(self) -> bool:
+        return bool(
+            self.subtensor
+            and self.subtensor.substrate
+            and self.subtensor.substrate.ws
+            and self.subtensor.substrate.ws.state is WebSocketClientState.OPEN
+        )
+
+    def _reconnect_subtensor_websocket(self):
+        """
+        Reopens the websocket of the existing substrate. SubstrateInterface.connect() returns the (new)
+        websocket without storing it, so it is assigned to substrate.ws here, as the substrate's own init does.
+        """
+        try:
+            substrate = self.subtensor.substrate if self.subtensor else None
+            if substrate:
+                ws = substrate.connect()
+                if ws is not None:
+                    substrate.ws = ws
+        except Exception as e:
+            bt.logging.debug(f"Reconnecting subtensor websocket failed: {e}")
 
     def set_subtensor(self):
+        """
+        Makes sure the subtensor websocket is open. A dropped connection is first reopened on the existing
+        substrate; a new bt.subtensor is only built if that fails, with exponential backoff between attempts.
+        """
         try:
-            if (
-                self.subtensor
-                and self.subtensor.substrate
-                and self.subtensor.substrate.ws
-                and self.subtensor.substrate.ws.state is WebSocketClientState.OPEN
-            ):
-                # bt.logging.debug(
-                #     f"Subtensor already set"
-                # )
+            if self._subtensor_connected():
+                return
+            if time.time() < self._next_subtensor_attempt:
+                return
+
+            # Reopen the websocket of the existing substrate before paying for a new subtensor
+            self._reconnect_subtensor_websocket()
+            if self._subtensor_connected():
+                bt.logging.info("Subtensor websocket reconnected")
+                self._subtensor_backoff = 1.0
                 return
 
             bt.logging.info(
                 f"Getting subtensor"
             )
+            self._next_subtensor_attempt = time.time() + self._subtensor_backoff
+            self._subtensor_backoff = min(self._subtensor_backoff * 2, 30)
 
             self.subtensor = bt.subtensor(config=self.config)
+            self._subtensor_backoff = 1.0
+            self._next_subtensor_attempt = 0.0
 
             # check registered
             self.check_registered()
@@ -228,11 +392,16 @@ class BaseNeuron(ABC):
         """
         self.set_subtensor()
 
+        # The epoch length was started from the cached tempo; confirm it on the neuron's own connection
+        if self._epoch_length_refresh_due:
+            self._set_epoch_length_from_chain()
+
         # Ensure miner or validator hotkey is still registered on the network.
         self.check_registered()
 
         if self.should_sync_metagraph():
             self.resync_metagraph()
+            self.get_serving_mask()
 
         if self.should_set_weights():
             self.set_weights()
@@ -240,14 +409,38 @@ class BaseNeuron(ABC):
         # Always save state.
         self.save_state()
 
-        self.refresh_business_server_access()
+        self.start_business_server_refresh()
 
 
+    def get_serving_mask(self) -> np.ndarray:
+        """
+        Returns is_serving of every metagraph axon as one bool array.
+        It is read once per metagraph sync (a sync replaces the axon list) instead of per UID and per call.
+        """
+        axons = self.metagraph.axons
+        if self._serving_axons is not axons:
+            self._serving_mask = np.fromiter(
+                (axon.is_serving for axon in axons), dtype=bool, count=len(axons)
+            )
+            self._serving_axons = axons
+        return self._serving_mask
+
+    def get_uid_for_hotkey(self, hotkey: str) -> typing.Optional[int]:
+        """
+        Returns the UID registered to hotkey, or None if it is not in the metagraph.
+        Looks it up in a hotkey -> UID dict rebuilt once per metagraph sync instead of scanning metagraph.hotkeys.
+        """
+        hotkeys = self.metagraph.hotkeys
+        if self._hotkey_index_src is not hotkeys:
+            self._hotkey_to_uid = {hotkey: uid for uid, hotkey in enumerate(hotkeys)}
+            self._hotkey_index_src = hotkeys
+        return self._hotkey_to_uid.get(hotkey)
+
     def check_registered(self):
         # --- Check for registration.
         if not self.subtensor.is_hotkey_registered(
             netuid=self.config.netuid,
-            hotkey_ss58=self.wallet.hotkey.ss58_address,
+            hotkey_ss58=self._hotkey_ss58,
         ):
             bt.logging.error(
                 f"Wallet: {self.wallet} is not registered on netuid {self.config.netuid}."
@@ -258,21 +451,21 @@ class BaseNeuron(ABC):
     def get_epoch_length(self) -> int:
         """
         Returns the epoch length in blocks.
-        This value is set during initialization from the chain.
+        This value is set during initialization from the cached chain tempo and refreshed from the chain.
         
         Returns:
             int: The epoch length in blocks
         """
-        return self.config.neuron.epoch_length
+        return self._epoch_length
 
     def should_sync_metagraph(self):
         """
         Check if enough epoch blocks have elapsed since the last checkpoint to sync.
         """
-        bt.logging.trace(f"block: {self.block}, last_update: {self.metagraph.last_update[self.uid]}, epoch_length: {self.get_epoch_length()}")
+        bt.logging.trace(f"block: {self.block}, last_update: {self.metagraph.last_update[self.uid]}, epoch_length: {self._epoch_length}")
         return (
             self.block - self.metagraph.last_update[self.uid]
-        ) > self.get_epoch_length()
+        ) > self._epoch_length
 
     def should_set_weights(self) -> bool:
         # Don't set weights on initialization.
@@ -286,11 +479,11 @@ class BaseNeuron(ABC):
             return False
 
         # Define appropriate logic for when set weights.
-        if (self.block - self.metagraph.last_update[self.uid]) > self.get_epoch_length():
-            bt.logging.trace(f"Should set weights, block: {self.block}, last_update: {self.metagraph.last_update[self.uid]}, epoch_length: {self.get_epoch_length()}")
+        if (self.block - self.metagraph.last_update[self.uid]) > self._epoch_length:
+            bt.logging.trace(f"Should set weights, block: {self.block}, last_update: {self.metagraph.last_update[self.uid]}, epoch_length: {self._epoch_length}")
             return True
         else:
-            bt.logging.trace(f"Not setting weights, block: {self.block}, last_update: {self.metagraph.last_update[self.uid]}, epoch_length: {self.get_epoch_length()}")
+            bt.logging.trace(f"Not setting weights, block: {self.block}, last_update: {self.metagraph.last_update[self.uid]}, epoch_length: {self._epoch_length}")
             return False
 
     def save_state(self):
@@ -310,37 +503,110 @@ class BaseNeuron(ABC):
 
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals and record API key to .env file"""
+        # A second signal during shutdown (e.g. SIGINT then SIGTERM) must not record the key again
+        if self._shutdown_started:
+            sys.exit(0)
+        self._shutdown_started = True
         bt.logging.info(f"Received signal {signum}, shutting down gracefully...")
-        bt.logging.info(f"Current API key name: {self.current_api_key_name}")
-        bt.logging.info(f"Current API key value: {'*' * len(self.current_api_key_value) if self.current_api_key_value else 'None'}")
+        bt.logging.debug(f"Current API key name: {self.current_api_key_name}")
+        bt.logging.debug(f"Current API key value: {'***' if self.current_api_key_value else 'None'}")
         settings.record_api_key_to_env(self.current_api_key_name, self.current_api_key_value)
         sys.exit(0)
 
 
-    def refresh_business_server_access(self):
-        """Refresh both neuron registration and service access tokens from business server"""
+    def start_business_server_refresh(self):
+        """
+        Runs refresh_business_server_access on a background thread so sync() never blocks on the business server.
+        Only one refresh runs at a time, and failed refreshes are retried with exponential backoff.
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        if time.time() < self._next_refresh_attempt:
+            return
+        if not self._business_server_refresh_due():
+            return
+
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_business_server_access_with_backoff,
+            name="BusinessServerRefresh",
+            daemon=True,
+        )
+        self._refresh_thread.start()
+
+    def _refresh_business_server_access_with_backoff(self):
+        if self.refresh_business_server_access():
+            self._refresh_backoff = 1.0
+            self._next_refresh_attempt = 0.0
+        else:
+            self._next_refresh_attempt = time.time() + self._refresh_backoff
+            bt.logging.debug(f"Business server refresh failed, retrying in {self._refresh_backoff:.0f}s")
+            self._refresh_backoff = min(self._refresh_backoff * 2, 300)
+
+    def _update_refresh_deadline(self):
+        """Recomputes the absolute time at which the first of the two tokens needs a refresh."""
+        self._next_refresh_deadline = (
+            min(self.last_neuron_registration_expire, self.last_service_token_expire) - self._refresh_interval_s
+        )
+
+    def _business_server_refresh_due(self) -> bool:
+        """
+        A refresh can only be needed once a token deadline has passed or a metagraph sync has replaced
+        the axons (the axon data may have changed); otherwise it is a single comparison.
+        """
+        return time.time() >= self._next_refresh_deadline or self.metagraph.axons is not self._axon_data_src
+
+    def _get_neuron_access_token(self, min_validity: float) -> dict:
+        """
+        Returns the cached neuron access token, creating a new one when it expires within min_validity seconds.
+
+        Args:
+            min_validity (float): Minimum remaining lifetime in seconds for the cached token to be reused.
+
+        Returns:
+            dict: The token and its expiration as returned by create_neuron_access_token.
+        """
+        cached = self._neuron_token_cache
+        if not cached or not cached.get("exp") or cached["exp"] - time.time() < min_validity:
+            cached = create_neuron_access_token(data={})
+            self._neuron_token_cache = cached
+        return cached
+
+    def refresh_business_server_access(self) -> bool:
+        """
+        Refresh both neuron registration and service access tokens from business server
+
+        Returns:
+            bool: False if the refresh was needed but failed, True otherwise.
+        """
         try:
-            # Check if we have an API key to use
+            # Check if we have an API key to use (the background login may still be replacing it)
+            self.wait_for_business_server_login()
             if not self.current_api_key_value:
                 bt.logging.warning("No API key available for business server registration")
-                return
+                return False
+
+            if not self._business_server_refresh_due():
+                return True
 
             # Check if either token needs refresh (5 minutes before expiration)
-            token_refresh_interval = min(settings.NEURON_JWT_EXPIRE_IN * 60, 300)  # Convert to seconds
-            neuron_token_expired = (self.last_neuron_registration_expire - time.time()) < token_refresh_interval
-            service_token_expired = (self.last_service_token_expire - time.time()) < token_refresh_interval
+            token_refresh_interval = self._refresh_interval_s
+            tokens_expired = time.time() >= self._next_refresh_deadline
+            axons = self.metagraph.axons
             _axon_data = self.get_axon_data()
+            self._axon_data_src = axons
             
-            if not (neuron_token_expired or service_token_expired or _axon_data != self.axon_data):
+            if not (tokens_expired or _axon_data != self.axon_data):
                 bt.logging.debug(f"tokens and axon still valid, skipping refresh")
-                return
+                return True
 
             self.axon_data = _axon_data
             
             # Prepare neuron registration data with authentication token
             data = {}
-            # Create authentication token for business server access
-            data["token"] = create_neuron_access_token(data=data)
+            # Reuse the cached authentication token for business server access while it stays valid
+            # for a full refresh interval, otherwise sign a new one
+            neuron_token = self._get_neuron_access_token(min_validity=token_refresh_interval * 2)
+            data["token"] = neuron_token
             
             # Register neuron with business server and get both tokens
             # This is the correct approach - registration includes token exchange
@@ -349,7 +615,7 @@ class BaseNeuron(ABC):
             
             if result.get("success"):
                 # Update both token expiration times
-                self.last_neuron_registration_expire = time.time() + settings.NEURON_JWT_EXPIRE_IN * 60
+                self.last_neuron_registration_expire = neuron_token.get("exp") or time.time() + settings.NEURON_JWT_EXPIRE_IN * 60
                 
                 # Update service token if returned
                 if result.get("access_token") and result.get("exp"):
@@ -357,10 +623,14 @@ class BaseNeuron(ABC):
                     self.current_api_key_value = result.get("access_token")
                     settings.SRV_API_KEY = self.current_api_key_value
                     bt.logging.debug(f"Service token refreshed, expires at: {result.get('exp')}")
+                self._update_refresh_deadline()
+                return True
             else:
                 bt.logging.error(f"Failed to register with business server: {result}")
+                return False
         except Exception as e:
             bt.logging.error(f"Failed to refresh business server access: {e}")
+            return False
 
     def get_axon_data(self):
         _axon = self.metagraph.axons[self.uid]
@@ -373,18 +643,28 @@ class BaseNeuron(ABC):
             "hotkey": _axon.hotkey,
             "coldkey": _axon.coldkey
         }
-        bt.logging.debug(f"axon data: {_axon_data}")
+        if is_debug_enabled():
+            bt.logging.debug(f"axon data: {_axon_data}")
         # Print all keys of the axon object
         # bt.logging.debug(f"axon attributes: {vars(_axon)}")
         return _axon_data
 
+    def get_service_client(self) -> ServiceApiClient:
+        """Returns the neuron's business server client, carrying the current API key."""
+        self.wait_for_business_server_login()
+        if self._service_client is None:
+            self._service_client = ServiceApiClient(self.current_api_key_value)
+        else:
+            self._service_client.set_token(self.current_api_key_value)
+        return self._service_client
+
     def api_post(self, endpoint: str, data: dict = None):
         try:
             payload = copy.deepcopy(data)
-            client = ServiceApiClient(self.current_api_key_value)
+            client = self.get_service_client()
             payload["version"] = self.spec_version
             payload["uid"] = int(self.uid)
-            payload["account"] = self.wallet.hotkey.ss58_address
+            payload["account"] = self._hotkey_ss58
             payload["chain"] = "bittensor"
             payload["netuid"] = self.config.netuid
             payload["type"] = self.neuron_type
@@ -157,6 +157,9 @@ class BaseValidatorNeuron(BaseNeuron):
             Exception: For unforeseen errors during the miner's operation, which are logged for diagnosis.
         """
 
+        # The login started in __init__ sets the API key forward uses; wait for it off the event loop
+        await asyncio.to_thread(self.wait_for_business_server_login)
+
         # Check that validator is registered on the network.
         self.sync()
 
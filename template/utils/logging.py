@@ -2,6 +2,8 @@ import os
 import logging
 from logging.handlers import RotatingFileHandler
 
+import bittensor as bt
+
 EVENTS_LEVEL_NUM = 38
 DEFAULT_LOG_BACKUP_COUNT = 10
 
@@ -33,3 +35,13 @@ def setup_events_logger(full_path, events_retention_size):
     logger.addHandler(file_handler)
 
     return logger
+
+
+def is_debug_enabled() -> bool:
+    """
+    Returns True if bittensor logging currently emits DEBUG records.
+
+    Use it to guard debug messages whose f-string formatting is expensive (large payloads, long uid lists),
+    since the f-string is evaluated before bt.logging.debug can discard it.
+    """
+    return bt.logging.get_level() <= logging.DEBUG
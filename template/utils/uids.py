@@ -1,44 +1,40 @@
-import random
 import bittensor as bt
 import numpy as np
 from typing import List
+from template.utils.logging import is_debug_enabled
 
 
-def check_uid_availability(
-    metagraph: "bt.metagraph.Metagraph", uid: int, vpermit_tao_limit: int
-) -> bool:
-    """Check if uid is available. The UID should be available if it is serving and has less than vpermit_tao_limit stake
+def get_uid_availability_mask(
+    metagraph: "bt.metagraph.Metagraph", vpermit_tao_limit: int, serving: np.ndarray = None
+) -> np.ndarray:
+    """Availability of every uid: a uid is available if its axon is serving. Inactive, unstaked and
+    over-vpermit_tao_limit uids are still available and only counted in one summary debug log.
     Args:
         metagraph (:obj: bt.metagraph.Metagraph): Metagraph object
-        uid (int): uid to be checked
         vpermit_tao_limit (int): Validator permit tao limit
+        serving (np.ndarray, optional): Precomputed is_serving of every axon
     Returns:
-        bool: True if uid is available, False otherwise
+        np.ndarray: Boolean mask, True where the uid is available
     """
-    # Filter non serving axons.
-    if not metagraph.axons[uid].is_serving:
-        bt.logging.debug(f"Uid: {uid} is not serving")
-        return False
-        
-    # Filter inactive nodes
-    if not metagraph.active[uid]:
-        bt.logging.warning(f"Uid: {uid} is not active")
-        return True
-        
-    # Filter nodes with no stake
-    if metagraph.S[uid] <= 0:
-        bt.logging.warning(f"Uid: {uid} has no stake")
-        return True
-        
-    # Filter validator permit > 1024 stake.
-    if metagraph.validator_permit[uid]:
-        # For validators, no stake limit
-        return True
-    else:
-        # For non-validators, just log a warning if stake exceeds limit
-        if metagraph.S[uid] > vpermit_tao_limit:
-            bt.logging.warning(f"Uid: {uid} has more than vpermit_tao_limit stake: {metagraph.S[uid]}")
-        return True
+    n = int(metagraph.n)
+    if serving is None:
+        serving = np.fromiter(
+            (axon.is_serving for axon in metagraph.axons), dtype=bool, count=n
+        )
+    serving = serving[:n]
+    if is_debug_enabled():
+        active = np.asarray(metagraph.active, dtype=bool)[:n]
+        stake = np.asarray(metagraph.S, dtype=np.float64)[:n]
+        validator_permit = np.asarray(metagraph.validator_permit, dtype=bool)[:n]
+        bt.logging.debug(
+            f"Uid availability: {np.count_nonzero(~serving)} not serving, "
+            f"{np.count_nonzero(serving & ~active)} not active, "
+            f"{np.count_nonzero(serving & active & (stake <= 0))} with no stake, "
+            f"{np.count_nonzero(serving & active & ~validator_permit & (stake > vpermit_tao_limit))} "
+            f"with more than vpermit_tao_limit stake"
+        )
+    # Inactive, unstaked and over-limit uids are only logged, so availability is the serving mask
+    return serving
 
 
 def get_random_uids(self, k: int, exclude: List[int] = None) -> np.ndarray:
@@ -51,27 +47,30 @@ def get_random_uids(self, k: int, exclude: List[int] = None) -> np.ndarray:
     Notes:
         If `k` is larger than the number of available `uids`, set `k` to the number of available `uids`.
     """
-    candidate_uids = []
-    avail_uids = []
-
-    for uid in range(self.metagraph.n.item()):
-        uid_is_available = check_uid_availability(
-            self.metagraph, uid, self.config.neuron.vpermit_tao_limit
+    # Neurons keep the is_serving mask from their last metagraph sync
+    serving = self.get_serving_mask() if hasattr(self, "get_serving_mask") else None
+    avail_uids = np.flatnonzero(
+        get_uid_availability_mask(
+            self.metagraph, self.config.neuron.vpermit_tao_limit, serving=serving
         )
-        uid_is_not_excluded = exclude is None or uid not in exclude
-
-        if uid_is_available:
-            avail_uids.append(uid)
-            if uid_is_not_excluded:
-                candidate_uids.append(uid)
+    )
+    if exclude:
+        candidate_uids = avail_uids[
+            np.isin(avail_uids, np.asarray(exclude, dtype=np.int64), invert=True)
+        ]
+    else:
+        candidate_uids = avail_uids
     # If k is larger than the number of available uids, set k to the number of available uids.
     k = min(k, len(avail_uids))
+    rng = getattr(self, "rng", None) or np.random.default_rng()
     # Check if candidate_uids contain enough for querying, if not grab all avaliable uids
-    available_uids = candidate_uids
     if len(candidate_uids) < k:
-        available_uids += random.sample(
-            [uid for uid in avail_uids if uid not in candidate_uids],
-            k - len(candidate_uids),
+        extra_uids = np.setdiff1d(avail_uids, candidate_uids, assume_unique=True)
+        candidate_uids = np.concatenate(
+            [
+                candidate_uids,
+                rng.choice(extra_uids, size=k - len(candidate_uids), replace=False),
+            ]
         )
-    uids = np.array(random.sample(available_uids, k))
+    uids = rng.choice(candidate_uids, size=k, replace=False)
     return uids
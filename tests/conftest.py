@@ -0,0 +1,5 @@
+# Put the project root on sys.path once, before pytest collects the test modules
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
@@ -0,0 +1,118 @@
+"""
+Chain objects shared by the test modules.
+
+Building a metagraph or TaoilliumAPI syncs from the chain and a wallet reads its keyfiles, and the tests
+only read them, so each is built once per process and reused by every test.
+bittensor and template.api are imported on first use, so tests that need neither do not load them.
+Unless RUN_CHAIN_TESTS is set, get_metagraph() returns an in-memory FakeMetagraph instead of syncing.
+"""
+
+import argparse
+import functools
+import os
+import threading
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+from services.config import settings
+
+# Set RUN_CHAIN_TESTS=1 to run against the chain in settings instead of fakes
+RUN_CHAIN_TESTS = bool(os.getenv("RUN_CHAIN_TESTS"))
+
+
+@dataclass
+class FakeMetagraph:
+    """In-memory stand-in for bt.metagraph, with the attributes the tests read."""
+    netuid: int = settings.CHAIN_NETUID
+    network: str = settings.CHAIN_NETWORK
+    block: int = 1000
+    axons: list = field(default_factory=list)
+    validator_permit: list = field(default_factory=list)
+    hotkeys: list = field(default_factory=list)
+    S: list = field(default_factory=list)
+    validator_trust: list = field(default_factory=list)
+
+    @property
+    def n(self) -> int:
+        return len(self.axons)
+
+
+def make_fake_metagraph(
+    serving=(True, True, False, True, False, False),
+    validator_permit=(True, False, False, False, True, False),
+    stake=None,
+    validator_trust=None,
+) -> FakeMetagraph:
+    """
+    Returns a FakeMetagraph with one uid per entry, mixing serving and non-serving validators and miners.
+    stake and validator_trust default to zero for every uid.
+    """
+    n = len(serving)
+    return FakeMetagraph(
+        axons=[SimpleNamespace(is_serving=is_serving, ip=f"10.0.0.{uid}", port=8091) for uid, is_serving in enumerate(serving)],
+        validator_permit=list(validator_permit),
+        hotkeys=[f"5FakeHotkey{uid}" for uid in range(n)],
+        S=list(stake) if stake is not None else [0.0] * n,
+        validator_trust=list(validator_trust) if validator_trust is not None else [0.0] * n,
+    )
+
+
+def make_offline_api(metagraph: FakeMetagraph = None):
+    """
+    Returns a TaoilliumAPI over metagraph (default make_fake_metagraph()) with no wallet, subtensor or dendrite,
+    for testing its selection logic and caches without a chain.
+    """
+    from template.api import TaoilliumAPI
+
+    api = object.__new__(TaoilliumAPI)
+    api._init_state()
+    api.metagraph_cache_ttl = 0
+    api._metagraph_lock = threading.Lock()
+    api.metagraph = metagraph if metagraph is not None else make_fake_metagraph()
+    return api
+
+
+@functools.lru_cache(maxsize=1)
+def get_metagraph(netuid: int = settings.CHAIN_NETUID, network: str = settings.CHAIN_NETWORK):
+    """Returns the metagraph of netuid, synced once, or a FakeMetagraph when chain tests are off."""
+    if not RUN_CHAIN_TESTS:
+        metagraph = make_fake_metagraph()
+        metagraph.netuid, metagraph.network = netuid, network
+        return metagraph
+    import bittensor as bt
+
+    return bt.metagraph(netuid=netuid, network=network)
+
+
+@functools.lru_cache(maxsize=1)
+def get_wallet_config(name: str = settings.WALLET_NAME, hotkey: str = settings.HOTKEY_NAME):
+    """Returns the bt.config of the wallet configured in settings."""
+    import bittensor as bt
+
+    parser = argparse.ArgumentParser()
+    bt.wallet.add_args(parser)
+    config = bt.config(parser)
+    config.wallet.name = name
+    config.wallet.hotkey = hotkey
+    return config
+
+
+@functools.lru_cache(maxsize=1)
+def get_wallet(name: str = settings.WALLET_NAME, hotkey: str = settings.HOTKEY_NAME):
+    """Returns the wallet configured in settings."""
+    import bittensor as bt
+
+    return bt.wallet(config=get_wallet_config(name, hotkey))
+
+
+@functools.lru_cache(maxsize=1)
+def get_api_client(name: str = settings.WALLET_NAME, hotkey: str = settings.HOTKEY_NAME):
+    """Returns a TaoilliumAPI for the settings wallet, netuid and network."""
+    from template.api import TaoilliumAPI
+
+    return TaoilliumAPI(
+        wallet=get_wallet(name, hotkey),
+        netuid=settings.CHAIN_NETUID,
+        network=settings.CHAIN_NETWORK,
+        chain_endpoint=settings.CHAIN_ENDPOINT
+    )
@@ -15,6 +15,8 @@ def run_new_tests():
     # Create test suite
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
+    tests_dir = os.path.dirname(os.path.abspath(__file__))
+    top_level_dir = os.path.dirname(tests_dir)
     
     # Add our new test modules
     test_modules = [
@@ -23,13 +25,12 @@ def run_new_tests():
         'test_api_fix'
     ]
     
+    # discover() imports the modules as part of the tests package, so an import
+    # error shows up as a failing test instead of an empty module
     for module_name in test_modules:
-        try:
-            module = __import__(module_name)
-            suite.addTests(loader.loadTestsFromModule(module))
-            print(f"✅ Loaded tests from {module_name}")
-        except Exception as e:
-            print(f"❌ Failed to load tests from {module_name}: {e}")
+        module_suite = loader.discover(tests_dir, pattern=f"{module_name}.py", top_level_dir=top_level_dir)
+        suite.addTests(module_suite)
+        print(f"✅ Loaded {module_suite.countTestCases()} tests from {module_name}")
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
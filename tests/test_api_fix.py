@@ -4,41 +4,22 @@ Test cases for TaoilliumAPI miner selection fix
 """
 
 import unittest
-import sys
-import os
 
-# Add the project root to the path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-import bittensor as bt
 from services.config import settings
-from template.api import TaoilliumAPI
+from tests.fixtures import get_api_client, get_wallet
 
 
 class TestTaoilliumAPIMinerSelection(unittest.TestCase):
     """Test cases for TaoilliumAPI miner selection functionality"""
 
-    def setUp(self):
-        """Set up test fixtures"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up one API client shared by all tests (each one syncs a metagraph)"""
         try:
-            # Create wallet
-            import argparse
-            parser = argparse.ArgumentParser()
-            bt.wallet.add_args(parser)
-            config = bt.config(parser)
-            config.wallet.name = settings.WALLET_NAME
-            config.wallet.hotkey = settings.HOTKEY_NAME
-            self.wallet = bt.wallet(config=config)
-            
-            # Create API client
-            self.api_client = TaoilliumAPI(
-                wallet=self.wallet, 
-                netuid=settings.CHAIN_NETUID, 
-                network=settings.CHAIN_NETWORK,
-                chain_endpoint=settings.CHAIN_ENDPOINT
-            )
+            cls.wallet = get_wallet()
+            cls.api_client = get_api_client()
         except Exception as e:
-            self.skipTest(f"Failed to set up API client: {e}")
+            raise unittest.SkipTest(f"Failed to set up API client: {e}")
 
     def test_api_client_creation(self):
         """Test that TaoilliumAPI client can be created successfully"""
@@ -0,0 +1,75 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from websockets.protocol import State
+
+import template.base.neuron as neuron_module
+from template.base.neuron import BaseNeuron
+
+
+class _Neuron(BaseNeuron):
+    """BaseNeuron with the abstract methods filled in; tests build it without __init__."""
+
+    async def forward(self, synapse):
+        return synapse
+
+    def run(self):
+        pass
+
+
+def _make_neuron(substrate):
+    neuron = object.__new__(_Neuron)
+    neuron.subtensor = SimpleNamespace(substrate=substrate)
+    neuron.config = SimpleNamespace()
+    neuron.check_registered = mock.Mock()
+    return neuron
+
+
+class SetSubtensorTestCase(unittest.TestCase):
+    """
+    Tests for set_subtensor reopening a dropped websocket on the existing substrate.
+    """
+
+    def test_reconnect_assigns_returned_websocket(self):
+        new_ws = SimpleNamespace(state=State.OPEN)
+        substrate = mock.Mock()
+        substrate.ws = SimpleNamespace(state=State.CLOSED)
+        # connect() returns the new websocket without setting substrate.ws, like async-substrate-interface
+        substrate.connect.return_value = new_ws
+        neuron = _make_neuron(substrate)
+
+        with mock.patch.object(neuron_module.bt, "subtensor") as new_subtensor:
+            neuron.set_subtensor()
+
+        substrate.connect.assert_called_once()
+        self.assertIs(substrate.ws, new_ws)
+        new_subtensor.assert_not_called()
+
+    def test_open_websocket_is_left_alone(self):
+        substrate = mock.Mock()
+        substrate.ws = SimpleNamespace(state=State.OPEN)
+        neuron = _make_neuron(substrate)
+
+        with mock.patch.object(neuron_module.bt, "subtensor") as new_subtensor:
+            neuron.set_subtensor()
+
+        substrate.connect.assert_not_called()
+        new_subtensor.assert_not_called()
+
+    def test_failed_reconnect_builds_new_subtensor(self):
+        substrate = mock.Mock()
+        substrate.ws = SimpleNamespace(state=State.CLOSED)
+        substrate.connect.side_effect = OSError("connection refused")
+        neuron = _make_neuron(substrate)
+
+        with mock.patch.object(neuron_module.bt, "subtensor") as new_subtensor:
+            neuron.set_subtensor()
+
+        new_subtensor.assert_called_once_with(config=neuron.config)
+        self.assertIs(neuron.subtensor, new_subtensor.return_value)
+        neuron.check_registered.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
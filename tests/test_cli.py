@@ -0,0 +1,84 @@
+import unittest
+from unittest import mock
+
+import services.cli as cli
+
+
+class ExtractFirstJsonTestCase(unittest.TestCase):
+    """
+    Tests for extract_first_json, which returns the first complete JSON object in btcli output.
+    """
+
+    def test_single_object(self):
+        self.assertEqual(cli.extract_first_json('{"success": true}'), {"success": True})
+
+    def test_object_spanning_lines_with_surrounding_text(self):
+        output = 'Staking...\n{\n  "success": true,\n  "amount": 1.5\n}\nDone'
+        self.assertEqual(cli.extract_first_json(output), {"success": True, "amount": 1.5})
+
+    def test_first_of_several_objects(self):
+        # The former greedy first-'{' to last-'}' match failed to parse this output
+        output = '{"a": 1} trailing {"b": 2}'
+        self.assertEqual(cli.extract_first_json(output), {"a": 1})
+
+    def test_skips_braces_that_do_not_start_json(self):
+        output = 'Balance {unknown} -> {"success": false}'
+        self.assertEqual(cli.extract_first_json(output), {"success": False})
+
+    def test_nested_object(self):
+        self.assertEqual(cli.extract_first_json('x {"a": {"b": [1, 2]}} y'), {"a": {"b": [1, 2]}})
+
+    def test_no_json(self):
+        result = cli.extract_first_json("Error: wallet not found")
+        self.assertEqual(result["error"], "No JSON output found")
+        self.assertEqual(result["output"], "Error: wallet not found")
+
+    def test_incomplete_json(self):
+        result = cli.extract_first_json('result: {"success": tru')
+        self.assertEqual(result["error"], "Invalid JSON output")
+        self.assertEqual(result["json_str"], '{"success": tru')
+
+
+class StakeAddTtyFallbackTestCase(unittest.TestCase):
+    """
+    Tests for when stake_add retries a piped btcli run under a PTY.
+    """
+
+    ARGS = dict(wallet_name="w", hotkey="h", amount=1, netuid=1, password="p", network="test")
+
+    def setUp(self):
+        patcher = mock.patch.object(cli, "_btcli_needs_tty", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _stake_add(self, returncode, output):
+        with mock.patch.object(cli, "_run_btcli_piped", return_value=(returncode, output)), \
+                mock.patch.object(cli, "_run_btcli_pty", return_value='{"success": true}') as pty:
+            result = cli.stake_add(**self.ARGS)
+        return result, pty
+
+    def test_json_result_is_returned(self):
+        result, pty = self._stake_add(0, '{"success": true}')
+        self.assertEqual(result, {"success": True})
+        pty.assert_not_called()
+
+    def test_wrong_password_is_not_retried(self):
+        result, pty = self._stake_add(1, "Enter your password:\nDecrypting...\nFailed to decrypt key")
+        pty.assert_not_called()
+        self.assertIn("error", result)
+        self.assertFalse(cli._btcli_needs_tty)
+
+    def test_chain_error_is_not_retried(self):
+        result, pty = self._stake_add(1, "Submitting extrinsic...\nEOFError")
+        pty.assert_not_called()
+        self.assertFalse(cli._btcli_needs_tty)
+
+    def test_tty_failure_falls_back_to_pty(self):
+        result, pty = self._stake_add(1, "termios.error: (25, 'Inappropriate ioctl for device')")
+        pty.assert_called_once()
+        self.assertEqual(result, {"success": True})
+        self.assertTrue(cli._btcli_needs_tty)
+
+
+if __name__ == '__main__':
+    unittest.main()
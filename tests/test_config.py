@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import services.config as config
+
+
+class SpliceEnvLineTestCase(unittest.TestCase):
+    """
+    Tests for _splice_env_line, which updates one KEY=value line of the .env contents.
+    """
+
+    def test_updates_existing_key(self):
+        data = b"A=1\nSRV_API_KEY=old\nB=2\n"
+        self.assertEqual(config._splice_env_line(data, "SRV_API_KEY", "new"), b"A=1\nSRV_API_KEY=new\nB=2\n")
+
+    def test_updates_key_on_first_line(self):
+        self.assertEqual(config._splice_env_line(b"SRV_API_KEY=old\nB=2\n", "SRV_API_KEY", "new"), b"SRV_API_KEY=new\nB=2\n")
+
+    def test_updates_key_on_last_line_without_newline(self):
+        self.assertEqual(config._splice_env_line(b"A=1\nSRV_API_KEY=old", "SRV_API_KEY", "new"), b"A=1\nSRV_API_KEY=new\n")
+
+    def test_appends_missing_key(self):
+        self.assertEqual(config._splice_env_line(b"A=1\n", "SRV_API_KEY", "new"), b"A=1\nSRV_API_KEY=new\n")
+
+    def test_appends_after_line_without_newline(self):
+        self.assertEqual(config._splice_env_line(b"A=1", "SRV_API_KEY", "new"), b"A=1\nSRV_API_KEY=new\n")
+
+    def test_appends_to_empty_file(self):
+        self.assertEqual(config._splice_env_line(b"", "SRV_API_KEY", "new"), b"SRV_API_KEY=new\n")
+
+    def test_keeps_comments_and_similar_keys(self):
+        data = b"# SRV_API_KEY=commented\nMY_SRV_API_KEY=other\nSRV_API_KEY_5F=hotkey\n"
+        self.assertEqual(
+            config._splice_env_line(data, "SRV_API_KEY", "new"),
+            data + b"SRV_API_KEY=new\n",
+        )
+
+
+class WriteEnvFileTestCase(unittest.TestCase):
+    """
+    Tests for _write_env_file, which replaces the .env file through a temp file.
+    """
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.env_path = os.path.join(tmp_dir.name, ".env")
+        with open(self.env_path, "wb") as f:
+            f.write(b"A=1\n")
+        patcher = mock.patch.object(config, "env_file_path", self.env_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _read(self):
+        with open(self.env_path, "rb") as f:
+            return f.read()
+
+    def test_replaces_content(self):
+        config._write_env_file(b"A=2\n")
+        self.assertEqual(self._read(), b"A=2\n")
+        self.assertFalse(os.path.exists(self.env_path + ".tmp"))
+
+    def test_writes_in_place_when_rename_fails(self):
+        # A bind-mounted .env cannot be renamed over
+        with mock.patch.object(config.os, "replace", side_effect=OSError("Device or resource busy")):
+            config._write_env_file(b"A=3\n")
+        self.assertEqual(self._read(), b"A=3\n")
+        self.assertFalse(os.path.exists(self.env_path + ".tmp"))
+
+    def test_record_api_key_to_env_writes_immediately(self):
+        config.settings.record_api_key_to_env("SRV_API_KEY", "secret")
+        self.assertEqual(self._read(), b"A=1\nSRV_API_KEY=secret\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+
+import services.api as api
+
+
+class HttpClientSessionTestCase(unittest.TestCase):
+    """
+    Tests for the shared httpx sessions behind HttpClient.
+    """
+
+    POOL_MAXSIZE = 7
+
+    def tearDown(self):
+        api.close_all_sessions()
+
+    def test_session_pool_limits_on_transport(self):
+        # httpx ignores Client(limits=...) once a transport is passed, so the transport's pool must carry them
+        session = api._get_session(self.POOL_MAXSIZE)
+        pool = session._transport._pool
+        self.assertEqual(pool._max_connections, self.POOL_MAXSIZE)
+        self.assertEqual(pool._max_keepalive_connections, self.POOL_MAXSIZE)
+
+    def test_session_follows_redirects(self):
+        self.assertTrue(api._get_session(self.POOL_MAXSIZE).follow_redirects)
+
+    def test_session_shared_per_pool_size(self):
+        self.assertIs(api._get_session(self.POOL_MAXSIZE), api._get_session(self.POOL_MAXSIZE))
+        self.assertIsNot(api._get_session(self.POOL_MAXSIZE), api._get_session(self.POOL_MAXSIZE + 1))
+
+    def test_http_client_uses_pool_maxsize(self):
+        client = api.HttpClient("http://example.invalid", pool_maxsize=self.POOL_MAXSIZE)
+        self.assertEqual(client.session._transport._pool._max_connections, self.POOL_MAXSIZE)
+
+
+class GetLocalIpTestCase(unittest.TestCase):
+    """
+    Tests that get_local_ip remembers the resolved IP but not the fallback.
+    """
+
+    def setUp(self):
+        patcher = mock.patch.object(api, "_local_ip", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_failure_is_not_cached(self):
+        failing = mock.MagicMock()
+        failing.connect.side_effect = OSError("Network is unreachable")
+        working = mock.MagicMock()
+        working.getsockname.return_value = ("10.0.0.5", 12345)
+        with mock.patch.object(api.socket, "socket", side_effect=[failing, working, AssertionError("not cached")]):
+            self.assertEqual(api.get_local_ip(), "127.0.0.1")
+            self.assertEqual(api.get_local_ip(), "10.0.0.5")
+            self.assertEqual(api.get_local_ip(), "10.0.0.5")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,25 +4,21 @@ Test cases for miner detection logic
 """
 
 import unittest
-import sys
-import os
 
-# Add the project root to the path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-import bittensor as bt
 from services.config import settings
+from tests.fixtures import get_metagraph, make_fake_metagraph, make_offline_api
 
 
 class TestMinerDetection(unittest.TestCase):
     """Test cases for miner detection logic"""
 
-    def setUp(self):
-        """Set up test fixtures"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up the metagraph shared by all tests"""
         try:
-            self.metagraph = bt.metagraph(netuid=settings.CHAIN_NETUID, network=settings.CHAIN_NETWORK)
+            cls.metagraph = get_metagraph()
         except Exception as e:
-            self.skipTest(f"Failed to set up metagraph: {e}")
+            raise unittest.SkipTest(f"Failed to set up metagraph: {e}")
 
     def test_metagraph_initialization(self):
         """Test that metagraph can be initialized"""
@@ -32,103 +28,57 @@ class TestMinerDetection(unittest.TestCase):
 
     def test_node_status_consistency(self):
         """Test that node status information is consistent"""
-        total_nodes = len(self.metagraph.axons)
-        self.assertGreater(total_nodes, 0)
+        axons = self.metagraph.axons
+        validator_permit = self.metagraph.validator_permit
+        self.assertGreater(len(axons), 0)
         
         # Check that all nodes have consistent status information
-        for uid in range(total_nodes):
+        for permit, axon in zip(validator_permit, axons):
             # validator_permit should be a boolean
-            self.assertIsInstance(self.metagraph.validator_permit[uid], (bool, type(self.metagraph.validator_permit[uid])))
+            self.assertIsInstance(permit, (bool, type(permit)))
             
             # axon should exist and have is_serving attribute
-            axon = self.metagraph.axons[uid]
             self.assertIsNotNone(axon)
             self.assertIsInstance(axon.is_serving, (bool, type(axon.is_serving)))
 
     def test_miner_detection_logic(self):
-        """Test the miner detection logic"""
-        # Test the logic from TaoilliumAPI.get_miner_uids
-        non_validator_serving_uids = [
-            uid for uid in range(len(self.metagraph.axons))
-            if not self.metagraph.validator_permit[uid] and self.metagraph.axons[uid].is_serving
-        ]
-        
-        serving_validator_uids = [
-            uid for uid in range(len(self.metagraph.axons))
-            if self.metagraph.validator_permit[uid] and self.metagraph.axons[uid].is_serving
-        ]
-        
-        all_non_validator_uids = [
-            uid for uid in range(len(self.metagraph.axons))
-            if not self.metagraph.validator_permit[uid]
-        ]
-        
-        # Test that the logic produces consistent results
-        if non_validator_serving_uids:
-            miner_uids = non_validator_serving_uids
-        else:
-            miner_uids = serving_validator_uids
-            if not miner_uids:
-                miner_uids = all_non_validator_uids
-        
-        # Should have some potential miners (either serving or non-serving)
-        self.assertIsInstance(miner_uids, list)
-        
-        # All selected UIDs should be within valid range
-        for uid in miner_uids:
-            self.assertGreaterEqual(uid, 0)
-            self.assertLess(uid, len(self.metagraph.axons))
+        """Test that _select_miner_uids samples distinct UIDs from the highest-priority non-empty candidate list"""
+        cases = (
+            # (is_serving, validator_permit, expected pool)
+            ((True, True, False, True, False, False), (True, False, False, False, True, False), {1, 3}),
+            ((True, False, True), (True, False, True), {0, 2}),
+            ((False, False, False), (True, False, False), {1, 2}),
+        )
+        for serving, validator_permit, pool in cases:
+            api = make_offline_api(make_fake_metagraph(serving=serving, validator_permit=validator_permit))
+            for sample_size in (1, 2, 5):
+                for stake_weighted in (False, True):
+                    with self.subTest(serving=serving, sample_size=sample_size, stake_weighted=stake_weighted):
+                        uids = api._select_miner_uids(sample_size, stake_weighted=stake_weighted)
+                        self.assertEqual(len(uids), min(sample_size, len(pool)))
+                        self.assertEqual(len(set(uids)), len(uids))
+                        self.assertLessEqual(set(uids), pool)
 
-    def test_validator_miner_distribution(self):
-        """Test that we can identify validators and miners"""
-        validators = [
-            uid for uid in range(len(self.metagraph.axons))
-            if self.metagraph.validator_permit[uid]
-        ]
-        
-        miners = [
-            uid for uid in range(len(self.metagraph.axons))
-            if not self.metagraph.validator_permit[uid]
-        ]
-        
-        # Should have some validators and miners
-        self.assertIsInstance(validators, list)
-        self.assertIsInstance(miners, list)
-        
-        # Validators and miners should be mutually exclusive
-        validator_set = set(validators)
-        miner_set = set(miners)
-        self.assertEqual(len(validator_set.intersection(miner_set)), 0)
-        
-        # All UIDs should be either validator or miner
-        all_uids = set(range(len(self.metagraph.axons)))
-        self.assertEqual(validator_set.union(miner_set), all_uids)
-
-    def test_serving_status(self):
-        """Test serving status of nodes"""
-        serving_nodes = [
-            uid for uid in range(len(self.metagraph.axons))
-            if self.metagraph.axons[uid].is_serving
-        ]
-        
-        non_serving_nodes = [
-            uid for uid in range(len(self.metagraph.axons))
-            if not self.metagraph.axons[uid].is_serving
-        ]
-        
-        # Should have some serving and non-serving nodes
-        self.assertIsInstance(serving_nodes, list)
-        self.assertIsInstance(non_serving_nodes, list)
-        
-        # Serving and non-serving should be mutually exclusive
-        serving_set = set(serving_nodes)
-        non_serving_set = set(non_serving_nodes)
-        self.assertEqual(len(serving_set.intersection(non_serving_set)), 0)
-        
-        # All UIDs should be either serving or non-serving
-        all_uids = set(range(len(self.metagraph.axons)))
-        self.assertEqual(serving_set.union(non_serving_set), all_uids)
+    def test_no_miners_raises(self):
+        """Test that _select_miner_uids fails when every UID is a non-serving validator"""
+        api = make_offline_api(make_fake_metagraph(serving=(False, False), validator_permit=(True, True)))
+        with self.assertRaises(Exception):
+            api._select_miner_uids(1)
 
+    def test_compute_miner_candidates(self):
+        """Test that each candidate list holds the expected UIDs and the lower-priority lists are only filled as fallbacks"""
+        cases = (
+            # (is_serving, validator_permit, (non_validator_serving, serving_validator, all_non_validator))
+            ((True, True, False, True, False, False), (True, False, False, False, True, False), ([1, 3], [], [])),
+            ((True, False, False), (True, False, False), ([], [0], [])),
+            ((True, False, True), (True, False, True), ([], [0, 2], [])),
+            ((False, False, False), (True, False, False), ([], [], [1, 2])),
+            ((False, False), (True, True), ([], [], [])),
+        )
+        for serving, validator_permit, expected in cases:
+            with self.subTest(serving=serving, validator_permit=validator_permit):
+                api = make_offline_api(make_fake_metagraph(serving=serving, validator_permit=validator_permit))
+                self.assertEqual(api._compute_miner_candidates(), expected)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,6 +1,10 @@
 import sys
 import unittest
 import os
+import time
+from unittest import mock
+
+import jwt
 import services.security as security
 import services.config as config
 
@@ -9,17 +13,111 @@ class SecurityTestCase(unittest.TestCase):
     This class contains unit tests for the security module.
     """
 
-    def setUp(self):
-        self.uid = os.getenv("TEST_UID","1")
+    # Payload of the manage token shared by all tests
+    PAYLOAD = {"id": os.getenv("TEST_UID", "1"), "chain": "bittensor", "roles": ["wallet-manage"]}
+
+    @classmethod
+    def setUpClass(cls):
+        # One signed token serves every test, signing is the costly part
+        cls.token = security.create_manage_access_token(cls.PAYLOAD)
 
     def test_create_manage_access_token(self):
-        token = security.create_manage_access_token({"id": self.uid, "chain": "bittensor", "roles": ["wallet-manage"]})
-        print(token)
-        self.assertIsNotNone(token)
+        print(self.token)
+        self.assertIsNotNone(self.token)
 
     def test_verify_manage_token(self):
-        token = security.create_manage_access_token({"id": self.uid, "chain": "bittensor", "roles": ["wallet-manage"]})
-        self.assertIsNotNone(token)
-        self.assertTrue(security.verify_manage_token(token))
+        self.assertTrue(security.verify_manage_token(self.token))
+
+    def test_verify_manage_token_cached(self):
+        first = security.verify_manage_token(self.token)
+        second = security.verify_manage_token(f"Bearer {self.token}")
+        self.assertEqual(first, second)
+        self.assertIsNone(security.verify_manage_token(self.token + "x"))
+
+
+class TokenEncodingTestCase(unittest.TestCase):
+    """
+    Tests that _encode_token produces the same tokens as PyJWT, for every supported algorithm.
+    """
+
+    SECRET = "test-secret-key-with-enough-length-for-hs512"
+    ALGORITHMS = ("HS256", "HS384", "HS512")
+
+    def _payload(self):
+        now = int(time.time())
+        return {"id": "1", "roles": ["wallet-manage"], "iat": now, "exp": now + 60}
+
+    def test_encode_token_decodes_with_pyjwt(self):
+        for algorithm in self.ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                payload = self._payload()
+                token = security._encode_token(payload, self.SECRET, algorithm)
+                self.assertEqual(jwt.get_unverified_header(token), {"alg": algorithm, "typ": "JWT"})
+                self.assertEqual(jwt.decode(token, self.SECRET, algorithms=[algorithm]), payload)
+
+    def test_pyjwt_token_decodes_with_decode_token(self):
+        for algorithm in self.ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                payload = self._payload()
+                token = jwt.encode(payload, self.SECRET, algorithm=algorithm)
+                self.assertEqual(security._decode_token(token, self.SECRET, algorithm), payload)
+
+    def test_neuron_token_claims(self):
+        with mock.patch.object(security.settings, "NEURON_JWT_SECRET_KEY", self.SECRET), \
+                mock.patch.object(security.settings, "NEURON_JWT_ALGORITHM", "HS256"):
+            first = security.create_neuron_access_token({"uid": 1})
+            second = security.create_neuron_access_token({"uid": 1})
+        payload = jwt.decode(first["token"], self.SECRET, algorithms=["HS256"])
+        # iat/exp are whole seconds, as jwt.encode would have written them from datetimes
+        self.assertIsInstance(payload["iat"], int)
+        self.assertIsInstance(payload["exp"], int)
+        self.assertEqual(payload["exp"], first["exp"])
+        # The nanosecond salt keeps tokens minted within the same second distinct
+        self.assertIsInstance(payload["salt"], int)
+        self.assertNotEqual(first["token"], second["token"])
+
+
+class VerifiedTokenCacheTestCase(unittest.TestCase):
+    """
+    Tests that the _decode_token verification cache never outlives a token or crosses keys.
+    """
+
+    SECRET = "test-secret-key-with-enough-length-for-hs512"
+
+    def setUp(self):
+        with security._verified_tokens_lock:
+            security._verified_tokens.clear()
+
+    def test_expired_token_is_evicted(self):
+        exp = int(time.time()) + 1
+        token = jwt.encode({"id": "1", "exp": exp}, self.SECRET, algorithm="HS256")
+        self.assertEqual(security._decode_token(token, self.SECRET, "HS256")["exp"], exp)
+        # The entry is cached no longer than the token's exp
+        self.assertLessEqual(security._verified_tokens[("HS256", self.SECRET, token)][1], exp)
+
+        time.sleep(max(0.0, exp - time.time()) + 1.1)
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            security._decode_token(token, self.SECRET, "HS256")
+        self.assertNotIn(("HS256", self.SECRET, token), security._verified_tokens)
+
+    def test_cache_entry_expires_after_ttl(self):
+        token = jwt.encode({"id": "1", "exp": int(time.time()) + 3600}, self.SECRET, algorithm="HS256")
+        security._decode_token(token, self.SECRET, "HS256")
+        later = time.time() + security._VERIFIED_TOKENS_TTL + 1
+        with mock.patch.object(security.time, "time", return_value=later), \
+                mock.patch.object(security.jwt, "decode", wraps=jwt.decode) as decode:
+            security._decode_token(token, self.SECRET, "HS256")
+        decode.assert_called_once()
+
+    def test_other_secret_misses_cache(self):
+        token = jwt.encode({"id": "1", "exp": int(time.time()) + 60}, self.SECRET, algorithm="HS256")
+        security._decode_token(token, self.SECRET, "HS256")
+        with self.assertRaises(jwt.InvalidSignatureError):
+            security._decode_token(token, "another-secret-key-of-a-reasonable-length", "HS256")
 
+    def test_other_algorithm_misses_cache(self):
+        token = jwt.encode({"id": "1", "exp": int(time.time()) + 60}, self.SECRET, algorithm="HS256")
+        security._decode_token(token, self.SECRET, "HS256")
+        with self.assertRaises(jwt.InvalidAlgorithmError):
+            security._decode_token(token, self.SECRET, "HS512")
 
@@ -0,0 +1,471 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+import template.api.taoillium_api as taoillium_api
+from template.api.get_query_axons import get_stake_candidate_uids
+from template.utils.uids import get_random_uids
+from tests.fixtures import make_fake_metagraph, make_offline_api
+
+
+class StakeCandidatesTestCase(unittest.TestCase):
+    """
+    Tests for get_stake_candidate_uids, the top-n-by-stake UIDs with validator trust.
+    """
+
+    STAKE = (1, 9, 3, 7, 0, 5, 2, 8, 4, 6)
+
+    def _candidates(self, stake, validator_trust=None, n=0.3):
+        serving = (True,) * len(stake)
+        metagraph = make_fake_metagraph(serving=serving, validator_permit=(False,) * len(stake), stake=stake,
+                                        validator_trust=validator_trust or (1.0,) * len(stake))
+        return get_stake_candidate_uids(metagraph, n=n)
+
+    def test_top_stake(self):
+        self.assertEqual(sorted(self._candidates(self.STAKE)), [1, 3, 7])
+
+    def test_without_validator_trust_dropped(self):
+        validator_trust = [1.0] * len(self.STAKE)
+        validator_trust[7] = 0.0
+        self.assertEqual(sorted(self._candidates(self.STAKE, validator_trust)), [1, 3])
+
+    def test_at_least_one(self):
+        self.assertEqual(self._candidates(self.STAKE, n=0.01), [1])
+
+    def test_all(self):
+        self.assertEqual(sorted(self._candidates(self.STAKE, n=1)), list(range(len(self.STAKE))))
+
+    def test_ties(self):
+        # Any k of the tied top UIDs may be picked, but never a lower-stake one
+        candidates = self._candidates((5, 5, 5, 1), n=0.5)
+        self.assertEqual(len(candidates), 2)
+        self.assertLessEqual(set(candidates), {0, 1, 2})
+
+    def test_zero_stake(self):
+        self.assertEqual(sorted(self._candidates((0, 0, 0, 0), (0.0, 1.0, 0.0, 1.0), n=1)), [1, 3])
+
+    def test_empty_metagraph(self):
+        self.assertEqual(self._candidates(()), [])
+
+    def test_cached_per_block_and_n(self):
+        api = make_offline_api(make_fake_metagraph(stake=(4, 3, 2, 1, 0, 0), validator_trust=(1,) * 6))
+        first = api._get_stake_candidates(0.5)
+        self.assertEqual(sorted(first), [0, 1, 2])
+        self.assertIs(api._get_stake_candidates(0.5), first)
+        self.assertEqual(api._get_stake_candidates(0.2), [0])
+        api.metagraph.block += 1
+        api.metagraph.S = [0, 0, 0, 1, 2, 3]
+        self.assertEqual(sorted(api._get_stake_candidates(0.5)), [3, 4, 5])
+
+
+class SampleUidsTestCase(unittest.TestCase):
+    """
+    Tests for _sample_uids: k distinct UIDs from the pool, stake-weighted or uniform.
+    """
+
+    def _api(self, stake):
+        n = len(stake)
+        return make_offline_api(make_fake_metagraph(serving=(True,) * n, validator_permit=(False,) * n, stake=stake))
+
+    def _assert_sample(self, uids, pool, k):
+        self.assertEqual(len(uids), k)
+        self.assertEqual(len(set(uids)), k)
+        self.assertLessEqual(set(uids), set(pool))
+        self.assertTrue(all(isinstance(uid, int) for uid in uids))
+
+    def test_bounds(self):
+        for n in (6, 80):
+            # Small pools use random.sample, pools of _NUMPY_SAMPLE_MIN or more numpy
+            for stake_weighted in (False, True):
+                for stake in ((0.0,) * n, (1.0,) * n):
+                    api = self._api(stake)
+                    pool = list(range(0, n, 2))
+                    for sample_size in (0, 1, len(pool), len(pool) + 5):
+                        with self.subTest(n=n, stake_weighted=stake_weighted, stake=stake[0], sample_size=sample_size):
+                            uids = api._sample_uids(pool, sample_size, stake_weighted=stake_weighted)
+                            self._assert_sample(uids, pool, min(sample_size, len(pool)))
+
+    def test_zero_stake_uids_fill_the_sample(self):
+        # Only uid 2 has stake; the zero-stake uids are still drawn to reach k
+        api = self._api((0, 0, 10, 0, -1, 0))
+        for _ in range(20):
+            uids = api._sample_uids(list(range(6)), 4, stake_weighted=True)
+            self._assert_sample(uids, range(6), 4)
+            self.assertIn(2, uids)
+
+    def test_stake_weighted_prefers_stake(self):
+        api = self._api((1000, 0, 0, 0, 0, 0))
+        picks = [api._sample_uids(list(range(6)), 1, stake_weighted=True)[0] for _ in range(50)]
+        self.assertEqual(set(picks), {0})
+
+
+class GetRandomUidsTestCase(unittest.TestCase):
+    """
+    Tests for get_random_uids over the serving uids, with excluded uids used only to fill up k.
+    """
+
+    def setUp(self):
+        # Serving uids are 0, 1 and 3
+        self.neuron = SimpleNamespace(
+            metagraph=make_fake_metagraph(),
+            config=SimpleNamespace(neuron=SimpleNamespace(vpermit_tao_limit=4096)),
+        )
+
+    def _assert_uids(self, uids, k):
+        self.assertEqual(len(uids), k)
+        self.assertEqual(len(set(uids.tolist())), k)
+        self.assertLessEqual(set(uids.tolist()), {0, 1, 3})
+
+    def test_samples_serving_uids(self):
+        for k in (1, 2, 3):
+            with self.subTest(k=k):
+                self._assert_uids(get_random_uids(self.neuron, k), k)
+
+    def test_k_capped_at_available(self):
+        self._assert_uids(get_random_uids(self.neuron, 10), 3)
+
+    def test_excluded_uids_skipped(self):
+        for _ in range(20):
+            uids = get_random_uids(self.neuron, 2, exclude=[1])
+            self.assertEqual(sorted(uids.tolist()), [0, 3])
+
+    def test_excluded_uids_fill_shortfall(self):
+        for _ in range(20):
+            uids = get_random_uids(self.neuron, 2, exclude=[0, 1])
+            self._assert_uids(uids, 2)
+            self.assertIn(3, uids.tolist())
+
+    def test_everything_excluded(self):
+        self._assert_uids(get_random_uids(self.neuron, 3, exclude=[0, 1, 3, 5]), 3)
+
+    def test_uses_neuron_serving_mask(self):
+        self.neuron.get_serving_mask = lambda: np.array([False, False, False, False, False, True])
+        self.assertEqual(get_random_uids(self.neuron, 3).tolist(), [5])
+
+
+class PrepareSynapseTestCase(unittest.TestCase):
+    """
+    Tests that prepare_synapse copies the validated template instead of sharing it.
+    """
+
+    def setUp(self):
+        self.api = make_offline_api()
+
+    def test_synapse_carries_input(self):
+        user_input = {"__type__": "chat", "text": "hi"}
+        synapse = self.api.prepare_synapse(user_input)
+        self.assertEqual(synapse.input, user_input)
+        self.assertEqual(synapse.output, {})
+
+    def test_template_is_not_shared(self):
+        first = self.api.prepare_synapse({"__type__": "chat"})
+        first.output["answer"] = 1
+        second = self.api.prepare_synapse({"__type__": "chat"})
+        self.assertIsNot(first, second)
+        self.assertEqual(second.output, {})
+        self.assertIsNone(self.api._synapse_template.input)
+        self.assertEqual(self.api._synapse_template.output, {})
+
+    def test_health_synapse_reused_per_uids(self):
+        first = self.api.prepare_synapse({"__type__": "health", "uids": [1, 3]})
+        self.assertIs(self.api.prepare_synapse({"__type__": "health", "uids": [1, 3]}), first)
+        other = self.api.prepare_synapse({"__type__": "health", "uids": [3]})
+        self.assertIsNot(other, first)
+        self.assertEqual(other.input, {"__type__": "health", "uids": [3]})
+
+    def test_health_with_extra_input_is_not_reused(self):
+        first = self.api.prepare_synapse({"__type__": "health", "uids": [1]})
+        self.assertIsNot(self.api.prepare_synapse({"__type__": "health", "uids": [1], "deep": True}), first)
+
+
+class HealthCheckTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests for health_check and the warm_pool() task it starts.
+    """
+
+    async def asyncSetUp(self):
+        self.api = make_offline_api()
+        self.api.dendrite = mock.Mock(aclose_session=mock.AsyncMock())
+        patcher = mock.patch.object(self.api, "query_network", mock.AsyncMock(return_value=["ok"]))
+        self.query_network = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_warm_pool_failure_is_logged(self):
+        with mock.patch.object(self.api, "warm_pool", mock.AsyncMock(side_effect=OSError("unreachable"))), \
+                mock.patch.object(taoillium_api.bt.logging, "warning") as warning:
+            self.assertEqual(await self.api.health_check(), ["ok"])
+            task = self.api._warm_task
+            await asyncio.wait([task])
+            # Done callbacks run on the next loop iteration
+            await asyncio.sleep(0)
+        warning.assert_called_once()
+        self.assertIn("unreachable", warning.call_args.args[0])
+
+    async def test_one_warm_up_per_interval(self):
+        now = 1000.0
+        warm_pool = mock.AsyncMock()
+        with mock.patch.object(self.api, "warm_pool", warm_pool), \
+                mock.patch.object(taoillium_api, "time", SimpleNamespace(monotonic=lambda: now)):
+            await self.api.health_check()
+            await self.api._warm_task
+            now += self.api._WARM_INTERVAL / 2
+            await self.api.health_check()
+            self.assertEqual(warm_pool.await_count, 1)
+            now += self.api._WARM_INTERVAL
+            await self.api.health_check()
+            await self.api._warm_task
+            self.assertEqual(warm_pool.await_count, 2)
+        self.assertEqual(self.query_network.await_count, 3)
+
+    async def test_running_warm_task_is_reused(self):
+        started = asyncio.Event()
+
+        async def warm_pool():
+            started.set()
+            await asyncio.sleep(3600)
+
+        with mock.patch.object(self.api, "warm_pool", warm_pool):
+            await self.api.health_check()
+            task = self.api._warm_task
+            await self.api.health_check()
+            self.assertIs(self.api._warm_task, task)
+            await started.wait()
+            await self.api.close()
+            await asyncio.wait([task])
+        self.assertTrue(task.cancelled())
+        self.api.dendrite.aclose_session.assert_awaited_once()
+        self.assertEqual(self.query_network.await_count, 2)
+
+
+class _FakeDendrite:
+    """Answers each axon with a dict holding its IP; has no external_ip, so no override is needed."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, axons, synapse, deserialize, timeout):
+        self.calls += 1
+        return [{"ip": axon.ip} for axon in axons]
+
+
+class QueryCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests for the query_network cache of health probes.
+    """
+
+    async def asyncSetUp(self):
+        self.api = make_offline_api()
+        self.api.dendrite = _FakeDendrite()
+        patcher = mock.patch.object(self.api, "_select_query_uids", mock.AsyncMock(return_value=[1, 3]))
+        self.select = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = 1000.0
+        # Only the module's clock is replaced; the event loop keeps the real time.monotonic
+        patcher = mock.patch.object(taoillium_api, "time", SimpleNamespace(monotonic=lambda: self.now))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _query(self, __type__="health", **kwargs):
+        return await self.api.query_network({"__type__": __type__, **kwargs}, sample_size=2, timeout=1)
+
+    async def test_hit_within_ttl(self):
+        first = await self._query()
+        self.now += self.api._QUERY_CACHE_TTL / 2
+        user_input = {"__type__": "health"}
+        self.assertEqual(await self.api.query_network(user_input, sample_size=2, timeout=1), first)
+        self.assertEqual(user_input["uids"], [1, 3])
+        self.assertEqual(self.select.await_count, 1)
+
+    async def test_cached_responses_are_copies(self):
+        expected = [{"ip": "10.0.0.1"}, {"ip": "10.0.0.3"}]
+        first = await self._query()
+        first[0]["ip"] = "mutated"
+        first.append("mutated")
+        second = await self._query()
+        self.assertEqual(second, expected)
+        second[1]["ip"] = "mutated"
+        self.assertEqual(await self._query(), expected)
+        self.assertEqual(self.select.await_count, 1)
+
+    async def test_miss_after_ttl(self):
+        await self._query()
+        self.now += self.api._QUERY_CACHE_TTL + 1
+        await self._query()
+        self.assertEqual(self.select.await_count, 2)
+
+    async def test_key_includes_input_and_arguments(self):
+        await self._query()
+        await self._query("ping")
+        await self._query(deep=True)
+        await self.api.query_network({"__type__": "health"}, sample_size=1, timeout=1)
+        self.assertEqual(self.select.await_count, 4)
+
+    async def test_uncacheable_requests(self):
+        for user_input in ({"__type__": "chat"}, {"__type__": "ping"}, {"__type__": "health", "uids": [1]}):
+            with self.subTest(user_input=user_input):
+                self.select.reset_mock()
+                await self.api.query_network(dict(user_input), sample_size=2, timeout=1)
+                await self.api.query_network(dict(user_input), sample_size=2, timeout=1)
+                self.assertEqual(self.select.await_count, 2)
+        self.assertEqual(self.api._query_cache, {})
+
+    async def test_oldest_entry_evicted(self):
+        for i in range(self.api._QUERY_CACHE_SIZE + 1):
+            await self._query(probe=i)
+        self.assertEqual(len(self.api._query_cache), self.api._QUERY_CACHE_SIZE)
+        self.select.reset_mock()
+        await self._query(probe=self.api._QUERY_CACHE_SIZE)
+        self.assertEqual(self.select.await_count, 0)
+        await self._query(probe=0)
+        self.assertEqual(self.select.await_count, 1)
+
+
+class UidCacheTestCase(unittest.TestCase):
+    """
+    Tests for the per-block miner candidate cache.
+    """
+
+    def setUp(self):
+        self.api = make_offline_api()
+
+    def test_reused_within_block(self):
+        with mock.patch.object(self.api, "_compute_miner_candidates", wraps=self.api._compute_miner_candidates) as compute:
+            first = self.api._get_miner_candidates()
+            self.assertIs(self.api._get_miner_candidates(), first)
+        compute.assert_called_once()
+        self.assertEqual(first, ([1, 3], [], []))
+
+    def test_recomputed_for_new_block(self):
+        self.api._get_miner_candidates()
+        self.api.metagraph = make_fake_metagraph(serving=(True, False, False), validator_permit=(True, False, False))
+        self.api.metagraph.block += 1
+        self.assertEqual(self.api._get_miner_candidates(), ([], [0], []))
+
+    def test_oldest_block_evicted(self):
+        size = self.api._UID_CACHE_SIZE
+        start = self.api.metagraph.block
+        for block in range(start, start + size + 1):
+            self.api.metagraph.block = block
+            self.api._get_miner_candidates()
+        self.assertEqual(list(self.api._uid_cache), list(range(start + 1, start + size + 1)))
+
+
+class MetagraphCacheTestCase(unittest.TestCase):
+    """
+    Tests for the metagraph snapshots saved under _METAGRAPH_CACHE_ROOT and reused within metagraph_cache_ttl.
+    """
+
+    TTL = 60
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.api = make_offline_api()
+        self.api._METAGRAPH_CACHE_ROOT = (tmp_dir.name,)
+        self.api.subtensor = SimpleNamespace(network="test")
+        self.api.netuid = 2
+        self.api.metagraph_cache_ttl = self.TTL
+        self.cache_dir = self.api._metagraph_cache_dir()
+        os.makedirs(self.cache_dir)
+        patcher = mock.patch.object(taoillium_api.bt, "metagraph")
+        self.bt_metagraph = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write_snapshot(self, block, age=0):
+        path = os.path.join(self.cache_dir, f"block-{block}.pt")
+        with open(path, "wb"):
+            pass
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def _snapshots(self):
+        return sorted(os.listdir(self.cache_dir))
+
+    def test_default_root_is_private(self):
+        # Pruning must not touch the snapshots neurons save to bittensor's default root
+        root = os.path.expanduser(os.path.join(*taoillium_api.TaoilliumAPI._METAGRAPH_CACHE_ROOT))
+        self.assertNotEqual(root, os.path.expanduser(os.path.join("~", ".bittensor", "metagraphs")))
+
+    def test_cache_dir_per_network_and_netuid(self):
+        self.assertEqual(self.cache_dir, os.path.join(self.api._METAGRAPH_CACHE_ROOT[0], "network-test", "netuid-2"))
+
+    def test_fresh_snapshot_is_loaded(self):
+        self._write_snapshot(100, age=self.TTL / 2)
+        metagraph = self.api._load_cached_metagraph()
+        self.assertIs(metagraph, self.bt_metagraph.return_value)
+        self.bt_metagraph.assert_called_once_with(netuid=2, network="test", lite=True, sync=False)
+        metagraph.load_from_path.assert_called_once_with(self.cache_dir)
+
+    def test_stale_snapshot_is_ignored(self):
+        self._write_snapshot(100, age=self.TTL * 2)
+        self.assertIsNone(self.api._load_cached_metagraph())
+        self.bt_metagraph.assert_not_called()
+
+    def test_newest_snapshot_decides_age(self):
+        self._write_snapshot(100, age=self.TTL * 2)
+        self._write_snapshot(110, age=self.TTL / 2)
+        self.assertIsNotNone(self.api._load_cached_metagraph())
+
+    def test_missing_snapshot(self):
+        self.assertIsNone(self.api._load_cached_metagraph())
+        self.bt_metagraph.assert_not_called()
+
+    def test_unreadable_snapshot(self):
+        self._write_snapshot(100)
+        self.bt_metagraph.return_value.load_from_path.side_effect = ValueError("corrupt")
+        self.assertIsNone(self.api._load_cached_metagraph())
+
+    def test_ttl_zero_disables_cache(self):
+        self.api.metagraph_cache_ttl = 0
+        self._write_snapshot(100)
+        metagraph = mock.Mock()
+        self.assertIsNone(self.api._load_cached_metagraph())
+        self.api._save_cached_metagraph(metagraph)
+        metagraph.save.assert_not_called()
+
+    def test_save_keeps_only_newest_snapshot(self):
+        self._write_snapshot(100, age=30)
+        self._write_snapshot(110, age=20)
+        metagraph = mock.Mock()
+        metagraph.save.side_effect = lambda root_dir: self._write_snapshot(120)
+        self.api._save_cached_metagraph(metagraph)
+        metagraph.save.assert_called_once_with(root_dir=list(self.api._METAGRAPH_CACHE_ROOT))
+        self.assertEqual(self._snapshots(), ["block-120.pt"])
+
+    def test_failed_save_keeps_snapshots(self):
+        self._write_snapshot(100, age=30)
+        self._write_snapshot(110, age=20)
+        metagraph = mock.Mock()
+        metagraph.save.side_effect = OSError("disk full")
+        self.api._save_cached_metagraph(metagraph)
+        self.assertEqual(self._snapshots(), ["block-100.pt", "block-110.pt"])
+
+    def test_load_metagraph_prefers_cache(self):
+        fake = make_fake_metagraph()
+        self.api._metagraph = None
+        self.api.subtensor.metagraph = mock.Mock()
+        with mock.patch.object(self.api, "_load_cached_metagraph", return_value=fake), \
+                mock.patch.object(self.api, "_save_cached_metagraph") as save:
+            self.assertIs(self.api.metagraph, fake)
+        self.api.subtensor.metagraph.assert_not_called()
+        save.assert_not_called()
+
+    def test_load_metagraph_syncs_and_saves_without_cache(self):
+        fake = make_fake_metagraph()
+        self.api._metagraph = None
+        self.api.subtensor.metagraph = mock.Mock(return_value=fake)
+        with mock.patch.object(self.api, "_save_cached_metagraph") as save:
+            self.assertIs(self.api.metagraph, fake)
+        self.api.subtensor.metagraph.assert_called_once_with(netuid=2)
+        save.assert_called_once_with(fake)
+
+
+if __name__ == '__main__':
+    unittest.main()
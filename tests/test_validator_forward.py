@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from neurons.validator import Validator
+from services.config import settings
+
+
+class ConcurrentForwardTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Tests for the long-lived forward workers behind Validator.concurrent_forward.
+    """
+
+    SLEEP = 0.02
+
+    async def asyncSetUp(self):
+        patcher = mock.patch.object(settings, "VALIDATOR_SLEEP_TIME", self.SLEEP)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.validator = object.__new__(Validator)
+        self.validator.should_exit = False
+        self.validator.step = 0
+        self.validator.config = SimpleNamespace(neuron=SimpleNamespace(num_concurrent_forwards=2))
+        self.validator.forward = mock.AsyncMock()
+        self.validator._get_ping_synapse = mock.Mock(side_effect=lambda slot: slot)
+
+    async def asyncTearDown(self):
+        await self.validator._stop_forward_workers()
+
+    async def test_workers_outlive_iterations(self):
+        await self.validator.concurrent_forward()
+        workers = dict(self.validator._forward_workers)
+        self.assertEqual(sorted(workers), [0, 1])
+        await self.validator.concurrent_forward()
+        self.assertEqual(self.validator._forward_workers, workers)
+        self.assertFalse(any(worker.done() for worker in workers.values()))
+        slots = {call.args[0] for call in self.validator.forward.await_args_list}
+        self.assertEqual(slots, {0, 1})
+
+    async def test_failing_forward_does_not_stop_worker(self):
+        self.validator.forward.side_effect = RuntimeError("business server down")
+        await self.validator.concurrent_forward()
+        await self.validator.concurrent_forward()
+        self.assertGreaterEqual(self.validator.forward.await_count, 3)
+        self.assertFalse(any(worker.done() for worker in self.validator._forward_workers.values()))
+
+    async def test_finished_worker_is_restarted(self):
+        self.validator._ensure_forward_workers(2)
+        finished = self.validator._forward_workers[0]
+        finished.cancel()
+        await asyncio.gather(finished, return_exceptions=True)
+        self.validator._ensure_forward_workers(2)
+        self.assertIsNot(self.validator._forward_workers[0], finished)
+
+    async def test_workers_stopped_on_exit(self):
+        await self.validator.concurrent_forward()
+        workers = list(self.validator._forward_workers.values())
+        self.validator.should_exit = True
+        await self.validator.concurrent_forward()
+        self.assertIsNone(self.validator._forward_workers)
+        self.assertTrue(all(worker.done() for worker in workers))
+
+
+if __name__ == '__main__':
+    unittest.main()